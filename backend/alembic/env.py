@@ -19,7 +19,7 @@ if config.config_file_name is not None:
 from app.core import Base
 
 # Import all models to ensure they are registered with Base.metadata
-from app.domains.auth.models import User
+from app.domains.auth.models import User, RefreshToken
 from app.domains.users.models import UserProfile, UserTradingPreferences
 from app.domains.market.models import MarketData
 from app.domains.ai_profile.models import AIProfile
@@ -0,0 +1,54 @@
+"""add partial indexes on user_profiles API key columns
+
+Revision ID: b7d3e1f4a9c2
+Revises: 681877288a4f
+Create Date: 2026-10-17 10:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e1f4a9c2'
+down_revision: Union[str, Sequence[str], None] = '681877288a4f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nom de l'index, colonne de clé API)
+PARTIAL_INDEXES = [
+    ('ix_profile_has_hyperliquid', 'hyperliquid_api_key'),
+    ('ix_profile_has_anthropic', 'anthropic_api_key'),
+    ('ix_profile_has_coingecko', 'coingecko_api_key'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema - Partial indexes for configured API keys."""
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        for index_name, column in PARTIAL_INDEXES:
+            op.create_index(
+                index_name,
+                'user_profiles',
+                ['user_id'],
+                unique=False,
+                postgresql_where=sa.text(f'{column} IS NOT NULL'),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Drop partial API key indexes."""
+    with op.get_context().autocommit_block():
+        for index_name, _ in PARTIAL_INDEXES:
+            op.drop_index(
+                index_name,
+                table_name='user_profiles',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,60 @@
+"""store trading preference enums as VARCHAR(16) with CHECK constraints
+
+Revision ID: c4a8f2d61e07
+Revises: b7d3e1f4a9c2
+Create Date: 2026-10-17 10:41:09.527781
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8f2d61e07'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e1f4a9c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (colonne, nom du type ENUM natif / de la contrainte, valeurs)
+ENUM_COLUMNS = [
+    ('risk_tolerance', 'risktolerance', ('LOW', 'MEDIUM', 'HIGH')),
+    ('investment_horizon', 'investmenthorizon', ('SHORT_TERM', 'MEDIUM_TERM', 'LONG_TERM')),
+    ('trading_style', 'tradingstyle', ('CONSERVATIVE', 'BALANCED', 'AGGRESSIVE')),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema - Native ENUM columns to VARCHAR(16) + CHECK."""
+    for column, enum_name, values in ENUM_COLUMNS:
+        op.alter_column(
+            'user_trading_preferences',
+            column,
+            type_=sa.String(length=16),
+            existing_nullable=False,
+            postgresql_using=f'{column}::text',
+        )
+        allowed = ", ".join(f"'{value}'" for value in values)
+        op.create_check_constraint(
+            enum_name,
+            'user_trading_preferences',
+            f'{column} IN ({allowed})',
+        )
+        postgresql.ENUM(name=enum_name).drop(op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Restore native ENUM columns."""
+    for column, enum_name, values in ENUM_COLUMNS:
+        op.drop_constraint(enum_name, 'user_trading_preferences', type_='check')
+        postgresql.ENUM(*values, name=enum_name).create(op.get_bind(), checkfirst=True)
+        op.alter_column(
+            'user_trading_preferences',
+            column,
+            type_=postgresql.ENUM(*values, name=enum_name, create_type=False),
+            existing_nullable=False,
+            postgresql_using=f'{column}::{enum_name}',
+        )
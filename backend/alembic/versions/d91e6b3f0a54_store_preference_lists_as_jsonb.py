@@ -0,0 +1,48 @@
+"""store preferred_assets / technical_indicators as JSONB
+
+Revision ID: d91e6b3f0a54
+Revises: c4a8f2d61e07
+Create Date: 2026-10-17 11:02:37.184402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91e6b3f0a54'
+down_revision: Union[str, Sequence[str], None] = 'c4a8f2d61e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JSON_COLUMNS = ['preferred_assets', 'technical_indicators']
+
+
+def upgrade() -> None:
+    """Upgrade schema - TEXT JSON lists to JSONB."""
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'user_trading_preferences',
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::jsonb',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema - JSONB back to TEXT."""
+    for column in JSON_COLUMNS:
+        op.alter_column(
+            'user_trading_preferences',
+            column,
+            type_=sa.Text(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::text',
+        )
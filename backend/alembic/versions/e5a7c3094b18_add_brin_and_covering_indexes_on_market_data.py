@@ -0,0 +1,74 @@
+"""add BRIN and covering indexes on market_data
+
+Revision ID: e5a7c3094b18
+Revises: d91e6b3f0a54
+Create Date: 2026-10-17 14:26:09.512733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c3094b18'
+down_revision: Union[str, Sequence[str], None] = 'd91e6b3f0a54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - BRIN on data_timestamp, covering (symbol, data_timestamp) index."""
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_market_data_ts_brin',
+            'market_data',
+            ['data_timestamp'],
+            unique=False,
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'idx_symbol_ts_cover',
+            'market_data',
+            ['symbol', 'data_timestamp'],
+            unique=False,
+            postgresql_include=['price_usd', 'volume_24h_usd'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Remplacé par l'index couvrant (mêmes colonnes clés)
+        op.drop_index(
+            'idx_symbol_timestamp',
+            table_name='market_data',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Restore idx_symbol_timestamp, drop BRIN and covering indexes."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_symbol_timestamp',
+            'market_data',
+            ['symbol', 'data_timestamp'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'idx_symbol_ts_cover',
+            table_name='market_data',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'idx_market_data_ts_brin',
+            table_name='market_data',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -7,7 +7,7 @@ Contient les composants fondamentaux de l'application
 from .config import Settings, settings
 
 # Database
-from .database import Base, engine, SessionLocal
+from .database import Base, engine, SessionLocal, async_engine, AsyncSessionLocal
 
 # Security
 from .security import (
@@ -15,10 +15,9 @@ from .security import (
     get_password_hash,
     encrypt_api_key,
     decrypt_api_key,
+    decrypt_api_key_cached,
     create_access_token,
-    create_refresh_token,
     verify_token,
-    authenticate_user,
 )
 
 # Exceptions
@@ -30,8 +29,14 @@ from .exceptions import (
     ValidationException,
 )
 
+# HTTP
+from .http import get_http_client, close_http_client
+
+# Cache
+from .cache import TTLCache
+
 # Dependencies
-from .deps import get_db, get_current_user
+from .deps import get_db, get_async_db, get_current_user, get_async_current_user, get_current_user_id
 
 __all__ = [
     # Configuration
@@ -41,22 +46,31 @@ __all__ = [
     "Base",
     "engine",
     "SessionLocal",
+    "async_engine",
+    "AsyncSessionLocal",
     # Security
     "verify_password",
     "get_password_hash",
     "encrypt_api_key",
     "decrypt_api_key",
+    "decrypt_api_key_cached",
     "create_access_token",
-    "create_refresh_token",
     "verify_token",
-    "authenticate_user",
     # Exceptions
     "AppException",
     "UnauthorizedException",
     "NotFoundException",
     "ForbiddenException",
     "ValidationException",
+    # HTTP
+    "get_http_client",
+    "close_http_client",
+    # Cache
+    "TTLCache",
     # Dependencies
     "get_db",
+    "get_async_db",
     "get_current_user",
+    "get_async_current_user",
+    "get_current_user_id",
 ]
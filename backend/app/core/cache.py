@@ -0,0 +1,64 @@
+"""
+Cache mémoire à expiration (cache-aside par processus)
+
+Chaque worker a son propre cache : les écritures invalident le cache local,
+et la durée de vie courte borne l'obsolescence vue par les autres workers.
+"""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Cache clé -> valeur avec expiration et taille maximale
+
+    Les accès sont protégés par un verrou : le cache peut être utilisé depuis
+    la boucle asyncio comme depuis le threadpool des dépendances synchrones.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 1024):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Retourne la valeur en cache, ou None si absente ou expirée"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._entries.pop(key, None)
+                return None
+
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Enregistre une valeur pour la durée de vie du cache"""
+        with self._lock:
+            now = time.monotonic()
+
+            if key not in self._entries and len(self._entries) >= self._max_size:
+                # Purger les entrées expirées, puis la plus ancienne si toujours plein
+                for expired in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+                    del self._entries[expired]
+                if len(self._entries) >= self._max_size:
+                    del self._entries[next(iter(self._entries))]
+
+            self._entries[key] = (value, now + self._ttl)
+
+    def delete(self, *keys: Hashable) -> None:
+        """Supprime des entrées (invalidation après écriture)"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
@@ -1,9 +1,10 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from .database import SessionLocal
+from .database import SessionLocal, AsyncSessionLocal
 from .security import verify_token
 from .exceptions import UnauthorizedException, NotFoundException
 
@@ -19,6 +20,24 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dépendance pour obtenir une session de base de données asynchrone"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    """
+    Dépendance légère : authentifie via le JWT sans requête en base
+
+    Pour les endpoints qui exigent une authentification mais n'utilisent pas l'utilisateur
+    """
+    token_data = verify_token(credentials.credentials, "access")
+    return token_data["user_id"]
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
@@ -29,7 +48,27 @@ def get_current_user(
     token = credentials.credentials
     token_data = verify_token(token, "access")
 
-    user = db.query(User).filter(User.id == token_data["user_id"]).first()
+    # Lookup par clé primaire (identity map de la session avant toute requête)
+    user = db.get(User, int(token_data["user_id"]))
+    if user is None:
+        raise NotFoundException("User not found")
+
+    return user
+
+
+async def get_async_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Dépendance asynchrone pour obtenir l'utilisateur authentifié
+
+    Chargé sur la session de get_async_db, partagée avec l'endpoint (FastAPI met
+    les dépendances en cache par requête) : une seule connexion par requête.
+    """
+    from ..domains.auth.models import User
+
+    user = await db.get(User, int(user_id))
     if user is None:
         raise NotFoundException("User not found")
 
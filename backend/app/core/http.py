@@ -0,0 +1,29 @@
+"""
+Client HTTP partagé
+
+Un seul httpx.AsyncClient pour tout le processus : les connexions TCP/TLS
+vers les APIs externes (Anthropic, ...) sont réutilisées entre les requêtes.
+"""
+
+from typing import Optional
+import httpx
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Retourne le client HTTP partagé (créé à la demande)"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Ferme le client HTTP partagé (arrêt de l'application)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -1,10 +1,13 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
 from jose import jwt
 from passlib.context import CryptContext
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
+import hashlib
+import os
+import time
 
 from .config import settings
 
@@ -18,8 +21,14 @@ def get_encryption_key():
         key = base64.urlsafe_b64encode(key)
     return key
 
+# Ancien format (Fernet : AES-128-CBC + HMAC-SHA256), conservé en lecture
 cipher_suite = Fernet(get_encryption_key())
 
+# Format actuel : AES-256-GCM (AEAD en une passe), jetons "v2:" + base64(nonce || ciphertext)
+_AESGCM_TOKEN_PREFIX = "v2:"
+_AESGCM_NONCE_SIZE = 12
+_aesgcm = AESGCM(hashlib.sha256(b"api-key-aesgcm:" + settings.encryption_key.encode()).digest())
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -29,7 +38,17 @@ def get_password_hash(password: str) -> str:
 def encrypt_api_key(api_key: str) -> str:
     if not api_key:
         return ""
-    return cipher_suite.encrypt(api_key.encode()).decode()
+    nonce = os.urandom(_AESGCM_NONCE_SIZE)
+    token = nonce + _aesgcm.encrypt(nonce, api_key.encode(), None)
+    return _AESGCM_TOKEN_PREFIX + base64.urlsafe_b64encode(token).decode()
+
+def _decrypt_token(encrypted_api_key: str) -> bytes:
+    """Déchiffre un jeton AES-GCM (v2) ou Fernet (ancien format)"""
+    if encrypted_api_key.startswith(_AESGCM_TOKEN_PREFIX):
+        token = base64.urlsafe_b64decode(encrypted_api_key[len(_AESGCM_TOKEN_PREFIX):])
+        nonce, ciphertext = token[:_AESGCM_NONCE_SIZE], token[_AESGCM_NONCE_SIZE:]
+        return _aesgcm.decrypt(nonce, ciphertext, None)
+    return cipher_suite.decrypt(encrypted_api_key.encode())
 
 def decrypt_api_key(encrypted_api_key: str) -> str:
     import logging
@@ -39,34 +58,53 @@ def decrypt_api_key(encrypted_api_key: str) -> str:
         return ""
 
     try:
-        decrypted_bytes = cipher_suite.decrypt(encrypted_api_key.encode())
-        decrypted = decrypted_bytes.decode('utf-8')
-
-        # Verifier que le resultat est ASCII valide
-        decrypted.encode('ascii')
-        return decrypted
+        # Un seul déchiffrement, les cas de décodage travaillent sur les mêmes octets
+        decrypted_bytes = _decrypt_token(encrypted_api_key)
+    except Exception as e:
+        logger.error(f"decrypt_api_key: Erreur dechiffrement - {type(e).__name__}: {e}")
+        return ""
 
+    try:
+        decrypted = decrypted_bytes.decode('utf-8')
     except UnicodeDecodeError:
         # Fallback si probleme de decodage UTF-8
-        decrypted_bytes = cipher_suite.decrypt(encrypted_api_key.encode())
         return decrypted_bytes.decode('utf-8', errors='ignore')
 
-    except UnicodeEncodeError:
-        # La cle contient des caracteres non-ASCII - traiter comme hex
-        decrypted = cipher_suite.decrypt(encrypted_api_key.encode()).decode('utf-8')
+    # Verifier que le resultat est ASCII valide
+    if decrypted.isascii():
+        return decrypted
 
-        # Si hex pur, retourner tel quel
-        if all(c in '0123456789abcdefABCDEF' for c in decrypted):
-            return decrypted
+    # La cle contient des caracteres non-ASCII - convertir chaque caractere en hex
+    hex_key = ''.join(f"{ord(char):02x}" for char in decrypted)
+    logger.info(f"decrypt_api_key: Conversion Unicode->hex effectuee (longueur: {len(hex_key)})")
+    return hex_key
+
+# Cache court des clés déchiffrées : ciphertext -> (plaintext, expiration monotonic)
+# Une rotation de clé change le ciphertext, l'ancienne entrée n'est donc jamais resservie
+_DECRYPT_CACHE_TTL = 60.0
+_DECRYPT_CACHE_MAX_SIZE = 1024
+_decrypt_cache: Dict[str, Tuple[str, float]] = {}
+
+def decrypt_api_key_cached(encrypted_api_key: str) -> str:
+    """decrypt_api_key avec cache en mémoire de courte durée (60 s)"""
+    now = time.monotonic()
+    entry = _decrypt_cache.get(encrypted_api_key)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+
+    decrypted = decrypt_api_key(encrypted_api_key)
+    if not decrypted:
+        return decrypted
 
-        # Sinon convertir chaque caractere en hex
-        hex_key = ''.join(f"{ord(char):02x}" for char in decrypted)
-        logger.info(f"decrypt_api_key: Conversion Unicode->hex effectuee (longueur: {len(hex_key)})")
-        return hex_key
+    if len(_decrypt_cache) >= _DECRYPT_CACHE_MAX_SIZE:
+        # Purger les entrées expirées, puis la plus ancienne si toujours plein
+        for key in [key for key, (_, expires_at) in _decrypt_cache.items() if expires_at <= now]:
+            del _decrypt_cache[key]
+        if len(_decrypt_cache) >= _DECRYPT_CACHE_MAX_SIZE:
+            del _decrypt_cache[next(iter(_decrypt_cache))]
 
-    except Exception as e:
-        logger.error(f"decrypt_api_key: Erreur dechiffrement - {type(e).__name__}: {e}")
-        return ""
+    _decrypt_cache[encrypted_api_key] = (decrypted, now + _DECRYPT_CACHE_TTL)
+    return decrypted
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -78,13 +116,6 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.jwt_algorithm)
     return encoded_jwt
 
-def create_refresh_token(data: dict):
-    to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=settings.jwt_refresh_token_expire_days)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.jwt_algorithm)
-    return encoded_jwt
-
 def verify_token(token: str, token_type: str = "access"):
     from .exceptions import UnauthorizedException
     from jose.exceptions import ExpiredSignatureError, JWTError
@@ -107,13 +138,3 @@ def verify_token(token: str, token_type: str = "access"):
     except Exception:
         # Autres erreurs
         raise UnauthorizedException("Could not validate credentials")
-
-def authenticate_user(db: Session, email: str, password: str):
-    from ..domains.auth.models import User
-
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        return False
-    if not verify_password(password, user.hashed_password):
-        return False
-    return user
@@ -5,8 +5,10 @@ Contient les domaines auth et users avec leurs models, schemas, services et rout
 
 from .auth import router as auth_router
 from .users import router as users_router
+from .users import stateless_router as users_stateless_router
 
 __all__ = [
     "auth_router",
     "users_router",
+    "users_stateless_router",
 ]
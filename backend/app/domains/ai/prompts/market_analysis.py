@@ -4,43 +4,43 @@ Prompts pour l'analyse de marché technique
 Migré depuis app/routes/claude.py (lignes 218-363)
 """
 
-import json
+import orjson
 from typing import Dict, Any, Optional
 
 
-def get_market_analysis_prompt(
-    technical_data: Dict[str, Any],
-    ticker: str,
-    profile: str,
-    exchange: str,
-    custom_prompt: Optional[str] = None
-) -> str:
-    """
-    Génère le prompt pour l'analyse technique d'un actif unique
+def _dump_json(data: Dict[str, Any]) -> str:
+    """Sérialise en JSON indenté (orjson, UTF-8 non échappé)"""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
 
-    Args:
-        technical_data: Données techniques multi-timeframes depuis MarketService
-        ticker: Symbole de l'actif (ex: BTC/USDT)
-        profile: Profil de trading (short, medium, long)
-        exchange: Exchange utilisé
-        custom_prompt: Instructions additionnelles optionnelles
 
-    Returns:
-        Prompt utilisateur complet pour l'analyse
+def _build_llm_digest(technical_data: Dict[str, Any]) -> str:
     """
+    Résumé compact des données techniques pour le prompt
 
-    # Récupérer le prix actuel depuis technical_data
-    current_price_info = technical_data.get('current_price', {})
-    current_price = current_price_info.get('current_price', 'N/A')
-
-    # Récupérer le timeframe principal
-    main_tf = technical_data.get('tf', 'N/A')
-
-    prompt = f"""
-ANALYSE TECHNIQUE - {ticker}
-Profil: {profile.upper()} | Exchange: {exchange} | Prix actuel: ${current_price}
-
-═══════════════════════════════════════════════════════════════
+    Les indicateurs restent en JSON ; les bougies (`last_20_candles`) passent
+    en CSV "t,o,h,l,c,v", une ligne par bougie, au lieu d'un tableau JSON
+    indenté (une valeur par ligne) : beaucoup moins de tokens en entrée.
+    """
+    indicators: Dict[str, Any] = {}
+    candle_sections = []
+
+    for key, value in technical_data.items():
+        if isinstance(value, dict) and "last_20_candles" in value:
+            candles = value["last_20_candles"]
+            value = {k: v for k, v in value.items() if k != "last_20_candles"}
+            if candles:
+                tf = value.get("tf") or technical_data.get("tf", "N/A")
+                rows = "\n".join(",".join(str(field) for field in candle) for candle in candles)
+                candle_sections.append(f"Dernières bougies {tf} ({key}) - t,o,h,l,c,v :\n{rows}")
+        indicators[key] = value
+
+    return "\n\n".join([_dump_json(indicators), *candle_sections])
+
+
+# Bloc d'instructions statique : identique octet pour octet d'un appel à l'autre,
+# il est placé AVANT les données pour servir de préfixe au cache de prompt
+# Anthropic (system prompt + instructions). Ne rien y interpoler.
+MARKET_ANALYSIS_INSTRUCTIONS = """═══════════════════════════════════════════════════════════════
 ⚡ PHILOSOPHIE DE RECOMMANDATION
 ═══════════════════════════════════════════════════════════════
 
@@ -54,11 +54,6 @@ Ta réputation dépend de la QUALITÉ, pas de la quantité.
 
 ⚠️ RÈGLE D'OR : En cas de doute, NE PAS recommander. Mieux vaut 0 trade que 1 mauvais trade.
 
-═══════════════════════════════════════════════════════════════
-DONNÉES TECHNIQUES MULTI-TIMEFRAMES
-═══════════════════════════════════════════════════════════════
-{json.dumps(technical_data, indent=2, ensure_ascii=False)}
-
 ═══════════════════════════════════════════════════════════════
 FORMAT DE RÉPONSE REQUIS (JSON strict)
 ═══════════════════════════════════════════════════════════════
@@ -66,16 +61,16 @@ FORMAT DE RÉPONSE REQUIS (JSON strict)
 // EXEMPLES selon contexte de marché:
 
 // CAS 1 - Aucune opportunité (incertitude/consolidation) :
-{{
+{
   "analysis_text": "Analyse détaillée...",
   "trade_recommendations": []
-}}
+}
 
 // CAS 2 - Une seule opportunité claire :
-{{
+{
   "analysis_text": "Analyse détaillée...",
   "trade_recommendations": [
-    {{
+    {
       "entry_price": 45000.0,
       "direction": "long",
       "stop_loss": 43500.0,
@@ -85,30 +80,30 @@ FORMAT DE RÉPONSE REQUIS (JSON strict)
       "confidence_level": 85,
       "risk_reward_ratio": 2.8,
       "portfolio_percentage": 3.5,
-      "timeframe": "{main_tf}",
+      "timeframe": "<timeframe principal>",
       "reasoning": "Justification technique détaillée (200-300 mots)..."
-    }}
+    }
   ]
-}}
+}
 
 // CAS 3 - Opportunités multiples (contextes/niveaux différents) :
-{{
+{
   "analysis_text": "Analyse détaillée...",
   "trade_recommendations": [
-    {{
+    {
       "entry_price": 44500.0,
       "direction": "long",
       "confidence_level": 78,
       "reasoning": "Setup conservateur sur support..."
-    }},
-    {{
+    },
+    {
       "entry_price": 46000.0,
       "direction": "long",
       "confidence_level": 82,
       "reasoning": "Setup breakout résistance..."
-    }}
+    }
   ]
-}}
+}
 
 ═══════════════════════════════════════════════════════════════
 INSTRUCTIONS D'ANALYSE
@@ -183,8 +178,51 @@ INSTRUCTIONS D'ANALYSE
    • Prix réalistes basés sur données fournies
    • Array vide [] est PRÉFÉRABLE à un trade médiocre"""
 
+
+def get_market_analysis_prompt(
+    technical_data: Dict[str, Any],
+    ticker: str,
+    profile: str,
+    exchange: str,
+    custom_prompt: Optional[str] = None
+) -> str:
+    """
+    Génère la partie variable du prompt pour l'analyse d'un actif unique
+
+    Les instructions et le format de réponse sont dans
+    MARKET_ANALYSIS_INSTRUCTIONS, envoyé en préfixe (mis en cache).
+
+    Args:
+        technical_data: Données techniques multi-timeframes depuis MarketService
+        ticker: Symbole de l'actif (ex: BTC/USDT)
+        profile: Profil de trading (short, medium, long)
+        exchange: Exchange utilisé
+        custom_prompt: Instructions additionnelles optionnelles
+
+    Returns:
+        Prompt utilisateur (données de l'actif) à envoyer après les instructions
+    """
+
+    # Récupérer le prix actuel depuis technical_data
+    current_price_info = technical_data.get('current_price', {})
+    current_price = current_price_info.get('current_price', 'N/A')
+
+    # Récupérer le timeframe principal
+    main_tf = technical_data.get('tf', 'N/A')
+
+    prompt = f"""
+ANALYSE TECHNIQUE - {ticker}
+Profil: {profile.upper()} | Exchange: {exchange} | Prix actuel: ${current_price} | Timeframe principal: {main_tf}
+
+═══════════════════════════════════════════════════════════════
+DONNÉES TECHNIQUES MULTI-TIMEFRAMES
+═══════════════════════════════════════════════════════════════
+{_build_llm_digest(technical_data)}"""
+
     # Ajouter instructions personnalisées si fournies
     if custom_prompt:
         prompt += f"\n\n=== INSTRUCTIONS ADDITIONNELLES ===\n{custom_prompt}"
 
+    prompt += "\n\nRéponds UNIQUEMENT avec le JSON valide au format décrit plus haut."
+
     return prompt
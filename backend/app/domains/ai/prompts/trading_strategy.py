@@ -4,7 +4,6 @@ Prompts pour la génération de recommandations de trading
 Migré depuis app/services/ai_trading_service.py (lignes 195-285)
 """
 
-import json
 from typing import Dict, Any, List, Optional
 
 
@@ -51,11 +50,8 @@ PROFIL UTILISATEUR:
 
 """
         if preferences.technical_indicators:
-            try:
-                indicators = json.loads(preferences.technical_indicators)
-                prompt += f"- Indicateurs préférés: {', '.join(indicators)}\n"
-            except:
-                pass
+            # Colonne JSONB : déjà une liste
+            prompt += f"- Indicateurs préférés: {', '.join(preferences.technical_indicators)}\n"
 
     # Données de marché
     prompt += "\nDONNÉES DE MARCHÉ RÉCENTES:\n"
@@ -8,22 +8,52 @@ Migré depuis:
 
 import httpx
 import asyncio
+import orjson
 import time
-from typing import Dict, Any, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, List, Optional
 import logging
 
+from ....core import get_http_client
 from .base import AIProvider
 
 logger = logging.getLogger(__name__)
 
+# Protection de l'API en amont : analyses simultanées bornées par processus,
+# nouvelles tentatives espacées sur surcharge (429 rate limit, 503/529 overloaded)
+_MAX_CONCURRENT_ANALYSES = 8
+_RETRY_STATUS_CODES = frozenset({429, 503, 529})
+_MAX_RETRIES = 2
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 10.0
+
+# Corps du test de connexion, sérialisé une seule fois : plus petit modèle
+# (Haiku 4.5), 5 tokens max, température 0 — sonde de vivacité minimale
+_TEST_CONNECTION_BODY = orjson.dumps({
+    "model": "claude-haiku-4-5-20251001",
+    "max_tokens": 5,
+    "temperature": 0,
+    "messages": [
+        {
+            "role": "user",
+            "content": "ping"
+        }
+    ]
+})
+
 
 class AnthropicProvider(AIProvider):
     """Provider pour l'API Anthropic (Claude)"""
 
-    def __init__(self):
+    def __init__(self, use_shared_client: bool = False):
+        # Client HTTP du processus (pool de connexions) résolu à chaque appel :
+        # jamais de référence conservée vers un client fermé à l'arrêt de
+        # l'application. Sinon, un client temporaire par appel.
+        self._use_shared_client = use_shared_client
         self._base_url = "https://api.anthropic.com/v1"
         self._anthropic_version = "2023-06-01"
         self._default_timeout = 30.0
+        self._semaphore = asyncio.Semaphore(_MAX_CONCURRENT_ANALYSES)
 
         # Configuration des timeouts par modèle
         self.model_timeouts = {
@@ -43,10 +73,91 @@ class AnthropicProvider(AIProvider):
     def provider_name(self) -> str:
         return "anthropic"
 
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Fournit le client partagé du processus, sinon un client temporaire"""
+        if self._use_shared_client:
+            yield get_http_client()
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
+
     @property
     def base_url(self) -> str:
         return self._base_url
 
+    async def _post_messages(
+        self,
+        client: httpx.AsyncClient,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        timeout: float
+    ) -> httpx.Response:
+        """
+        POST /messages avec backoff exponentiel sur les réponses de surcharge
+
+        Respecte l'en-tête Retry-After quand l'API le fournit. La dernière
+        réponse est retournée telle quelle si les tentatives sont épuisées.
+        """
+        body = orjson.dumps(payload)
+        for attempt in range(_MAX_RETRIES + 1):
+            response = await client.post(
+                f"{self._base_url}/messages",
+                headers=headers,
+                content=body,
+                timeout=timeout
+            )
+            if response.status_code not in _RETRY_STATUS_CODES or attempt == _MAX_RETRIES:
+                return response
+
+            try:
+                delay = float(response.headers.get("retry-after", ""))
+            except ValueError:
+                delay = _RETRY_BASE_DELAY * (2 ** attempt)
+            delay = min(delay, _RETRY_MAX_DELAY)
+
+            logger.warning(
+                f"Anthropic HTTP {response.status_code}, nouvelle tentative dans {delay:.1f}s "
+                f"({attempt + 1}/{_MAX_RETRIES})"
+            )
+            await asyncio.sleep(delay)
+
+        return response
+
+    @staticmethod
+    def _prompt_fields(prompt: str, system_prompt: str, cached_prefix: Optional[str]) -> Dict[str, Any]:
+        """
+        Champs "system" et "messages" de la requête
+
+        Avec un préfixe statique (cached_prefix), le system prompt et ce préfixe
+        sont envoyés en blocs, le dernier bloc statique portant un point de cache
+        (cache_control ephemeral) : Anthropic réutilise alors ce préfixe d'un
+        appel à l'autre (~5 min) et seule la partie variable est facturée plein
+        tarif. Le préfixe doit rester identique octet pour octet.
+        """
+        if not cached_prefix:
+            return {
+                "messages": [{"role": "user", "content": prompt}],
+                "system": system_prompt,
+            }
+
+        return {
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": cached_prefix,
+                            "cache_control": {"type": "ephemeral"}
+                        },
+                        {"type": "text", "text": prompt}
+                    ]
+                }
+            ],
+            "system": [{"type": "text", "text": system_prompt}],
+        }
+
     async def analyze(
         self,
         prompt: str,
@@ -65,7 +176,8 @@ class AnthropicProvider(AIProvider):
             model: ID du modèle Claude (ex: claude-sonnet-4-5-20250929)
             max_tokens: Nombre maximum de tokens
             temperature: Température (0-1)
-            **kwargs: api_key (requis)
+            **kwargs: api_key (requis), cached_prefix (instructions statiques
+                mises en cache, envoyées avant le prompt)
 
         Returns:
             Dict avec status, content, tokens_used, processing_time_ms
@@ -94,31 +206,23 @@ class AnthropicProvider(AIProvider):
                 max_tokens = self.model_max_tokens.get(model, 3072)
 
             # Préparer la requête
-            messages = [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-
             request_payload = {
                 "model": model,
                 "max_tokens": max_tokens,
-                "messages": messages,
-                "system": system_prompt,
+                **self._prompt_fields(prompt, system_prompt, kwargs.get("cached_prefix")),
                 "temperature": temperature
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self._base_url}/messages",
-                    headers={
+            async with self._semaphore, self._client() as client:
+                response = await self._post_messages(
+                    client,
+                    {
                         "Content-Type": "application/json",
                         "X-API-Key": api_key,
                         "anthropic-version": self._anthropic_version
                     },
-                    json=request_payload,
-                    timeout=timeout
+                    request_payload,
+                    timeout
                 )
 
                 processing_time_ms = int((time.time() - start_time) * 1000)
@@ -149,29 +253,10 @@ class AnthropicProvider(AIProvider):
                         "processing_time_ms": processing_time_ms
                     }
 
-                elif response.status_code == 401:
-                    return {
-                        "status": "error",
-                        "message": "Clé API Anthropic invalide ou expirée"
-                    }
-
-                elif response.status_code == 429:
-                    return {
-                        "status": "error",
-                        "message": "Limite de taux API Anthropic atteinte. Veuillez réessayer plus tard."
-                    }
-
                 else:
-                    error_detail = f"Code d'erreur HTTP: {response.status_code}"
-                    try:
-                        error_data = response.json()
-                        error_detail = error_data.get("error", {}).get("message", error_detail)
-                    except:
-                        pass
-
                     return {
                         "status": "error",
-                        "message": f"Erreur API Anthropic: {error_detail}"
+                        "message": self._http_error_message(response)
                     }
 
         except asyncio.TimeoutError:
@@ -194,6 +279,128 @@ class AnthropicProvider(AIProvider):
                 "message": f"Erreur inattendue: {str(e)}"
             }
 
+    async def analyze_stream(
+        self,
+        prompt: str,
+        system_prompt: str,
+        model: str,
+        max_tokens: int = 4000,
+        temperature: float = 0.3,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Génère une analyse avec Claude en streaming (API Messages, stream=true)
+
+        Args:
+            prompt: Prompt utilisateur
+            system_prompt: Instructions système
+            model: ID du modèle Claude
+            max_tokens: Nombre maximum de tokens
+            temperature: Température (0-1)
+            **kwargs: api_key (requis), cached_prefix (voir analyze)
+
+        Yields:
+            {"type": "delta", "text": ...} au fil de la génération, puis
+            {"type": "done", "tokens_used": ...}. Une erreur produit
+            {"type": "error", "message": ...} et termine le flux.
+        """
+        api_key = kwargs.get("api_key")
+        if not api_key or not api_key.startswith('sk-ant-'):
+            yield {"type": "error", "message": "Clé API Anthropic manquante ou invalide"}
+            return
+
+        timeout = self.model_timeouts.get(model, self._default_timeout)
+        if max_tokens == 4000:  # Si valeur par défaut, utiliser celle du modèle
+            max_tokens = self.model_max_tokens.get(model, 3072)
+
+        body = orjson.dumps({
+            "model": model,
+            "max_tokens": max_tokens,
+            **self._prompt_fields(prompt, system_prompt, kwargs.get("cached_prefix")),
+            "temperature": temperature,
+            "stream": True
+        })
+        tokens_used = 0
+
+        try:
+            async with self._semaphore, self._client() as client:
+                async with client.stream(
+                    "POST",
+                    f"{self._base_url}/messages",
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-API-Key": api_key,
+                        "anthropic-version": self._anthropic_version
+                    },
+                    content=body,
+                    timeout=timeout
+                ) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        yield {"type": "error", "message": self._http_error_message(response)}
+                        return
+
+                    # Flux SSE : seules les lignes "data:" portent l'événement (champ "type")
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+
+                        event = orjson.loads(line[5:])
+                        event_type = event.get("type")
+
+                        if event_type == "content_block_delta":
+                            text = event.get("delta", {}).get("text")
+                            if text:
+                                yield {"type": "delta", "text": text}
+                        elif event_type == "message_delta":
+                            tokens_used = event.get("usage", {}).get("output_tokens", tokens_used)
+                        elif event_type == "error":
+                            error_detail = event.get("error", {}).get("message", "erreur inconnue")
+                            yield {"type": "error", "message": f"Erreur API Anthropic: {error_detail}"}
+                            return
+
+        except httpx.TimeoutException:
+            yield {
+                "type": "error",
+                "message": f"Timeout lors de l'analyse (>{timeout}s). Essayez un modèle plus rapide."
+            }
+            return
+
+        except httpx.RequestError as e:
+            logger.error(f"Erreur requête streaming Anthropic: {e}")
+            yield {"type": "error", "message": f"Erreur de connexion: {str(e)}"}
+            return
+
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Événement SSE Anthropic illisible: {e}")
+            yield {"type": "error", "message": "Réponse Claude invalide (flux interrompu)"}
+            return
+
+        except Exception as e:
+            logger.error(f"Erreur inattendue lors de l'analyse en streaming: {e}")
+            yield {"type": "error", "message": f"Erreur inattendue: {str(e)}"}
+            return
+
+        yield {"type": "done", "tokens_used": tokens_used}
+
+    @staticmethod
+    def _http_error_message(response: httpx.Response) -> str:
+        """Message d'erreur utilisateur pour une réponse HTTP non 200 de l'API"""
+        if response.status_code == 401:
+            return "Clé API Anthropic invalide ou expirée"
+
+        if response.status_code == 429:
+            return "Limite de taux API Anthropic atteinte. Veuillez réessayer plus tard."
+
+        error_detail = f"Code d'erreur HTTP: {response.status_code}"
+        try:
+            error_data = response.json()
+            error_detail = error_data.get("error", {}).get("message", error_detail)
+        except ValueError:
+            pass
+
+        return f"Erreur API Anthropic: {error_detail}"
+
     async def test_connection(self, api_key: str) -> Dict[str, Any]:
         """
         Test rapide de connectivité avec l'API Anthropic
@@ -211,22 +418,7 @@ class AnthropicProvider(AIProvider):
                     "message": "Format de clé API invalide"
                 }
 
-            # Test minimal avec Haiku (le plus économique)
-            messages = [
-                {
-                    "role": "user",
-                    "content": "Hello"
-                }
-            ]
-
-            request_payload = {
-                "model": "claude-3-5-haiku-20241022",
-                "max_tokens": 10,
-                "messages": messages,
-                "system": "Respond with just 'OK'."
-            }
-
-            async with httpx.AsyncClient() as client:
+            async with self._client() as client:
                 response = await client.post(
                     f"{self._base_url}/messages",
                     headers={
@@ -234,7 +426,7 @@ class AnthropicProvider(AIProvider):
                         "X-API-Key": api_key,
                         "anthropic-version": self._anthropic_version
                     },
-                    json=request_payload,
+                    content=_TEST_CONNECTION_BODY,
                     timeout=10.0
                 )
 
@@ -259,10 +451,11 @@ class AnthropicProvider(AIProvider):
                         "message": f"Erreur HTTP: {response.status_code}"
                     }
 
-        except asyncio.TimeoutError:
+        except (asyncio.TimeoutError, httpx.TimeoutException):
             return {
                 "status": "error",
-                "message": "Timeout lors du test de connexion"
+                "message": "Timeout lors du test de connexion",
+                "timeout": True
             }
         except Exception as e:
             logger.error(f"Erreur test connexion: {e}")
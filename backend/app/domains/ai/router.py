@@ -6,10 +6,13 @@ Migré depuis:
 - app/routes/ai_recommendations.py (endpoints génération)
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
+from functools import lru_cache
 import logging
+import orjson
 
 from ...core import get_db, get_current_user
 from ...domains.auth.models import User
@@ -79,6 +82,47 @@ async def analyze_single_asset(
         )
 
 
+@router.post("/analyze/stream")
+async def analyze_single_asset_stream(
+    request: SingleAssetAnalysisRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Analyse single-asset en streaming (Server-Sent Events)
+
+    Même traitement que POST /ai/analyze, mais le texte généré est transmis
+    au fil de l'eau (événements `delta`) ; la réponse structurée complète
+    arrive dans l'événement `final` (même schéma que /ai/analyze).
+    """
+    try:
+        logger.info(f"Analyse single-asset (stream) pour utilisateur {current_user.id}: {request.ticker}")
+
+        events = await ai_service.analyze_single_asset_stream(
+            request=request,
+            user=current_user
+        )
+
+    except ValueError as ve:
+        logger.warning(f"Erreur métier analyse single-asset utilisateur {current_user.id}: {ve}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(ve)
+        )
+
+    except Exception as e:
+        logger.error(f"Erreur technique analyse single-asset utilisateur {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur interne lors de l'analyse"
+        )
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ═══════════════════════════════════════════════════════════════
 # TESTS ET VALIDATION
 # ═══════════════════════════════════════════════════════════════
@@ -158,16 +202,14 @@ async def get_available_providers():
         )
 
 
-@router.get("/models")
-async def get_available_models():
-    """
-    Retourne les informations sur les modèles IA disponibles
+# Contenu statique (ne change qu'au déploiement) : cache navigateur/proxy d'un jour
+_MODELS_CACHE_CONTROL = "public, max-age=86400"
 
-    Migré depuis GET /ai/models
 
-    Informatif pour l'interface utilisateur.
-    """
-    return {
+@lru_cache(maxsize=1)
+def _available_models_body() -> bytes:
+    """Sérialise une seule fois la description des modèles disponibles"""
+    return orjson.dumps({
         "default_model": ai_service.default_model,
         "supported_models": {
             "claude": [
@@ -200,4 +242,20 @@ async def get_available_models():
         ],
         "max_tokens": ai_service.max_tokens,
         "timeout_seconds": ai_service.timeout
-    }
+    })
+
+
+@router.get("/models")
+async def get_available_models():
+    """
+    Retourne les informations sur les modèles IA disponibles
+
+    Migré depuis GET /ai/models
+
+    Informatif pour l'interface utilisateur.
+    """
+    return Response(
+        content=_available_models_body(),
+        media_type="application/json",
+        headers={"Cache-Control": _MODELS_CACHE_CONTROL}
+    )
@@ -6,11 +6,12 @@ Migré depuis:
 - app/routes/claude.py (logique métier)
 """
 
-import json
 import hashlib
+import re
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
+import orjson
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 import logging
@@ -19,7 +20,15 @@ from ...domains.auth.models import User
 from ...domains.users.models import UserTradingPreferences
 from ...domains.market.models import MarketData
 from ...domains.market.service import MarketService
-from ...core import decrypt_api_key
+from ...domains.market.schemas import (
+    CurrentPriceInfo,
+    HigherTFFeatures,
+    LowerTFFeaturesLight,
+    MAIndicators,
+    MainTFFeaturesLight,
+    VolumeIndicators,
+)
+from ...core import decrypt_api_key_cached
 
 from .schemas import (
     AIProviderType,
@@ -32,10 +41,18 @@ from .schemas import (
 from .providers import AnthropicProvider
 from .providers.openai import OpenAIProvider
 from .providers.deepseek import DeepSeekProvider
-from .prompts import get_system_prompt, get_market_analysis_prompt
+from .prompts import get_system_prompt, get_market_analysis_prompt, MARKET_ANALYSIS_INSTRUCTIONS
 
 logger = logging.getLogger(__name__)
 
+# Objet JSON de la réponse IA : du premier "{" au dernier "}" (texte éventuel autour)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.S)
+
+
+def _sse_frame(event: str, data: bytes) -> bytes:
+    """Encode une trame Server-Sent Events (données JSON sur une seule ligne)"""
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
 
 class AIService:
     """Service d'orchestration pour les analyses IA"""
@@ -44,8 +61,10 @@ class AIService:
         self.market_service = MarketService()
 
         # Initialiser les providers disponibles
+        # Anthropic réutilise le pool de connexions partagé (pas de handshake TLS par appel),
+        # résolu à chaque appel : le service est créé à l'import, avant le lifespan
         self.providers = {
-            AIProviderType.ANTHROPIC: AnthropicProvider(),
+            AIProviderType.ANTHROPIC: AnthropicProvider(use_shared_client=True),
             AIProviderType.OPENAI: OpenAIProvider(),
             AIProviderType.DEEPSEEK: DeepSeekProvider(),
         }
@@ -96,9 +115,11 @@ class AIService:
             ValueError: Si la clé API n'est pas configurée
         """
         if provider_type == AIProviderType.ANTHROPIC:
-            if not user.anthropic_api_key:
+            # Les clés API sont portées par le profil (users.UserProfile), pas par User
+            encrypted_key = user.profile.anthropic_api_key if user.profile else None
+            if not encrypted_key:
                 raise ValueError("Clé API Anthropic non configurée")
-            return decrypt_api_key(user.anthropic_api_key)
+            return decrypt_api_key_cached(encrypted_key)
         # Autres providers à implémenter
         else:
             raise ValueError(f"Provider {provider_type} non supporté pour récupération clé API")
@@ -107,6 +128,176 @@ class AIService:
     # ANALYSE SINGLE-ASSET (migré depuis claude.py)
     # ═══════════════════════════════════════════════════════════════
 
+    async def _prepare_single_asset_analysis(
+        self,
+        request: SingleAssetAnalysisRequest,
+        user: User
+    ) -> Dict[str, Any]:
+        """
+        Étapes communes avant l'appel IA : clé API, données techniques, prompts
+
+        Args:
+            request: Paramètres de l'analyse
+            user: Utilisateur authentifié
+
+        Returns:
+            Dict avec api_key, technical_data, system_prompt, cached_prefix, user_prompt
+
+        Raises:
+            ValueError: Si la clé API manque ou si les données techniques sont en erreur
+        """
+        # 1. Récupérer la clé API
+        api_key = await self._get_user_api_key(user, AIProviderType.ANTHROPIC)
+
+        # 2. Récupérer données techniques multi-timeframes (600 bougies par TF)
+        technical_data = await self.market_service.get_multi_timeframe_analysis(
+            exchange_name=request.exchange,
+            symbol=request.ticker,
+            profile=request.profile
+        )
+
+        if "status" in technical_data and technical_data["status"] == "error":
+            raise ValueError(f"Erreur récupération données techniques: {technical_data['message']}")
+
+        # 3. Préparer les prompts
+        return {
+            "api_key": api_key,
+            "technical_data": technical_data,
+            "system_prompt": get_system_prompt(request.model.value),
+            "cached_prefix": MARKET_ANALYSIS_INSTRUCTIONS,
+            "user_prompt": get_market_analysis_prompt(
+                technical_data=technical_data,
+                ticker=request.ticker,
+                profile=request.profile,
+                exchange=request.exchange,
+                custom_prompt=request.custom_prompt
+            ),
+        }
+
+    @staticmethod
+    def _build_technical_light(
+        technical_data: Dict[str, Any],
+        request: SingleAssetAnalysisRequest
+    ) -> TechnicalDataLight:
+        """
+        Données techniques allégées (sans bougies) pour le frontend
+
+        Les données viennent de MarketService (calculées côté serveur, déjà au
+        bon format) : les modèles sont assemblés avec model_construct, sans
+        repasser par la validation Pydantic.
+        """
+        feat = technical_data.get("features") or {}
+        htf = technical_data.get("higher_tf") or {}
+        ltf = technical_data.get("lower_tf") or {}
+
+        return TechnicalDataLight.model_construct(
+            symbol=technical_data.get("symbol", request.ticker),
+            profile=technical_data.get("profile", request.profile),
+            tf=technical_data.get("tf", ""),
+            current_price=CurrentPriceInfo.model_construct(**(technical_data.get("current_price") or {})),
+            features=MainTFFeaturesLight.model_construct(
+                ma=MAIndicators.model_construct(**(feat.get("ma") or {})),
+                rsi14=feat.get("rsi14", 0),
+                atr14=feat.get("atr14", 0),
+                volume=VolumeIndicators.model_construct(**(feat.get("volume") or {})),
+            ),
+            higher_tf=HigherTFFeatures.model_construct(
+                tf=htf.get("tf", ""),
+                ma=MAIndicators.model_construct(**(htf.get("ma") or {})),
+                rsi14=htf.get("rsi14", 0),
+                atr14=htf.get("atr14", 0),
+                structure=htf.get("structure", ""),
+                nearest_resistance=htf.get("nearest_resistance", 0),
+            ),
+            lower_tf=LowerTFFeaturesLight.model_construct(
+                tf=ltf.get("tf", ""),
+                rsi14=ltf.get("rsi14", 0),
+                volume=VolumeIndicators.model_construct(**(ltf.get("volume") or {})),
+            )
+        )
+
+    def _build_analysis_response(
+        self,
+        request: SingleAssetAnalysisRequest,
+        request_id: str,
+        start_time: datetime,
+        technical_data: Dict[str, Any],
+        content: str,
+        tokens_used: int
+    ) -> StructuredAnalysisResponse:
+        """
+        Construit la réponse structurée à partir du texte complet de l'IA
+
+        Args:
+            request: Paramètres de l'analyse
+            request_id: Identifiant de la requête
+            start_time: Début du traitement
+            technical_data: Données techniques complètes
+            content: Texte complet retourné par l'IA
+            tokens_used: Tokens consommés
+
+        Returns:
+            Analyse structurée avec recommandations
+        """
+        # 5. Préparer données techniques allégées (sans bougies pour frontend)
+        technical_light = self._build_technical_light(technical_data, request)
+
+        # 6. Parser la réponse structurée de l'IA
+        trade_recommendations = []
+        analysis_text = content
+
+        try:
+            # Extraire le JSON (du premier "{" au dernier "}") en une passe
+            match = _JSON_OBJECT_RE.search(analysis_text)
+
+            if match:
+                structured_response = orjson.loads(match.group(0))
+
+                # Valider et construire les recommandations
+                for rec_data in structured_response.get("trade_recommendations", []):
+                    try:
+                        trade_rec = TradeRecommendation(**rec_data)
+                        trade_recommendations.append(trade_rec)
+                    except Exception as e:
+                        logger.warning(f"Recommandation trade invalide ignorée: {e}")
+                        continue
+
+                # Extraire analysis_text du JSON
+                analysis_text = structured_response.get("analysis_text", analysis_text)
+
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Erreur parsing JSON IA: {e}")
+            # Garder analysis_text brut et array vide
+        except Exception as e:
+            logger.error(f"Erreur inattendue parsing IA: {e}")
+
+        # 7. Calculer métriques de performance
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
+
+        # 8. Construire réponse finale
+        response = StructuredAnalysisResponse(
+            request_id=request_id,
+            timestamp=start_time,
+            model_used=request.model,
+            ticker=request.ticker,
+            exchange=request.exchange,
+            profile=request.profile,
+            technical_data=technical_light,
+            claude_analysis=analysis_text,
+            trade_recommendations=trade_recommendations,
+            tokens_used=tokens_used,
+            processing_time_ms=int(processing_time),
+            warnings=[]
+        )
+
+        logger.info(
+            f"Analyse {request_id} terminée - "
+            f"Tokens: {tokens_used}, Temps: {int(processing_time)}ms, "
+            f"Recommandations: {len(trade_recommendations)}"
+        )
+
+        return response
+
     async def analyze_single_asset(
         self,
         request: SingleAssetAnalysisRequest,
@@ -132,130 +323,32 @@ class AIService:
         logger.info(f"Analyse single-asset {request_id}: {request.ticker} - {request.profile}")
 
         try:
-            # 1. Récupérer la clé API
-            api_key = await self._get_user_api_key(user, AIProviderType.ANTHROPIC)
-
-            # 2. Récupérer données techniques multi-timeframes (600 bougies par TF)
-            technical_data = await self.market_service.get_multi_timeframe_analysis(
-                exchange_name=request.exchange,
-                symbol=request.ticker,
-                profile=request.profile
-            )
-
-            if "status" in technical_data and technical_data["status"] == "error":
-                raise ValueError(f"Erreur récupération données techniques: {technical_data['message']}")
-
-            # 3. Préparer les prompts
-            system_prompt = get_system_prompt(request.model.value)
-            user_prompt = get_market_analysis_prompt(
-                technical_data=technical_data,
-                ticker=request.ticker,
-                profile=request.profile,
-                exchange=request.exchange,
-                custom_prompt=request.custom_prompt
-            )
+            prepared = await self._prepare_single_asset_analysis(request, user)
 
             # 4. Appeler le provider IA
             provider = self._get_provider(AIProviderType.ANTHROPIC)
             ai_response = await provider.analyze(
-                prompt=user_prompt,
-                system_prompt=system_prompt,
+                prompt=prepared["user_prompt"],
+                system_prompt=prepared["system_prompt"],
                 model=request.model.value,
                 max_tokens=self.max_tokens,
                 temperature=0.3,
-                api_key=api_key
+                api_key=prepared["api_key"],
+                cached_prefix=prepared["cached_prefix"]
             )
 
             if ai_response["status"] != "success":
                 raise ValueError(f"Erreur analyse IA: {ai_response.get('message', 'Erreur inconnue')}")
 
-            # 5. Préparer données techniques allégées (sans bougies pour frontend)
-            technical_light = TechnicalDataLight(
-                symbol=technical_data.get("symbol", request.ticker),
-                profile=technical_data.get("profile", request.profile),
-                tf=technical_data.get("tf", ""),
-                current_price=technical_data.get("current_price", {}),
-                features={
-                    "ma": technical_data.get("features", {}).get("ma", {}),
-                    "rsi14": technical_data.get("features", {}).get("rsi14", 0),
-                    "atr14": technical_data.get("features", {}).get("atr14", 0),
-                    "volume": technical_data.get("features", {}).get("volume", {}),
-                },
-                higher_tf={
-                    "tf": technical_data.get("higher_tf", {}).get("tf", ""),
-                    "ma": technical_data.get("higher_tf", {}).get("ma", {}),
-                    "rsi14": technical_data.get("higher_tf", {}).get("rsi14", 0),
-                    "atr14": technical_data.get("higher_tf", {}).get("atr14", 0),
-                    "structure": technical_data.get("higher_tf", {}).get("structure", ""),
-                    "nearest_resistance": technical_data.get("higher_tf", {}).get("nearest_resistance", 0),
-                },
-                lower_tf={
-                    "tf": technical_data.get("lower_tf", {}).get("tf", ""),
-                    "rsi14": technical_data.get("lower_tf", {}).get("rsi14", 0),
-                    "volume": technical_data.get("lower_tf", {}).get("volume", {}),
-                }
-            )
-
-            # 6. Parser la réponse structurée de l'IA
-            trade_recommendations = []
-            analysis_text = ai_response.get("content", "")
-
-            try:
-                # Nettoyer et extraire le JSON
-                content_clean = analysis_text.strip()
-                start_idx = content_clean.find("{")
-                end_idx = content_clean.rfind("}") + 1
-
-                if start_idx != -1 and end_idx != 0:
-                    json_content = content_clean[start_idx:end_idx]
-                    structured_response = json.loads(json_content)
-
-                    # Valider et construire les recommandations
-                    for rec_data in structured_response.get("trade_recommendations", []):
-                        try:
-                            trade_rec = TradeRecommendation(**rec_data)
-                            trade_recommendations.append(trade_rec)
-                        except Exception as e:
-                            logger.warning(f"Recommandation trade invalide ignorée: {e}")
-                            continue
-
-                    # Extraire analysis_text du JSON
-                    analysis_text = structured_response.get("analysis_text", analysis_text)
-
-            except json.JSONDecodeError as e:
-                logger.warning(f"Erreur parsing JSON IA: {e}")
-                # Garder analysis_text brut et array vide
-            except Exception as e:
-                logger.error(f"Erreur inattendue parsing IA: {e}")
-
-            # 7. Calculer métriques de performance
-            processing_time = (datetime.now() - start_time).total_seconds() * 1000
-            tokens_used = ai_response.get("tokens_used", 0)
-
-            # 8. Construire réponse finale
-            response = StructuredAnalysisResponse(
-                request_id=request_id,
-                timestamp=start_time,
-                model_used=request.model,
-                ticker=request.ticker,
-                exchange=request.exchange,
-                profile=request.profile,
-                technical_data=technical_light,
-                claude_analysis=analysis_text,
-                trade_recommendations=trade_recommendations,
-                tokens_used=tokens_used,
-                processing_time_ms=int(processing_time),
-                warnings=[]
-            )
-
-            logger.info(
-                f"Analyse {request_id} terminée - "
-                f"Tokens: {tokens_used}, Temps: {int(processing_time)}ms, "
-                f"Recommandations: {len(trade_recommendations)}"
+            return self._build_analysis_response(
+                request,
+                request_id,
+                start_time,
+                prepared["technical_data"],
+                ai_response.get("content", ""),
+                ai_response.get("tokens_used", 0)
             )
 
-            return response
-
         except ValueError as ve:
             logger.error(f"Erreur analyse single-asset {request_id}: {ve}")
             raise
@@ -263,6 +356,72 @@ class AIService:
             logger.error(f"Erreur inattendue analyze_single_asset {request_id}: {e}")
             raise
 
+    async def analyze_single_asset_stream(
+        self,
+        request: SingleAssetAnalysisRequest,
+        user: User
+    ) -> AsyncIterator[bytes]:
+        """
+        Analyse single-asset en streaming SSE (text/event-stream)
+
+        La préparation (clé API, données techniques) est faite avant de retourner
+        le flux : ses erreurs (ValueError) restent des erreurs HTTP classiques.
+
+        Événements produits par le flux :
+        - `delta` : fragment de texte généré ({"text": ...})
+        - `final` : StructuredAnalysisResponse complète, parsée en fin de flux
+        - `error` : message d'erreur ({"message": ...}), termine le flux
+
+        Args:
+            request: Paramètres de l'analyse
+            user: Utilisateur authentifié
+
+        Returns:
+            Générateur asynchrone de trames SSE encodées
+        """
+        request_id = str(uuid.uuid4())
+        start_time = datetime.now()
+
+        logger.info(f"Analyse single-asset (stream) {request_id}: {request.ticker} - {request.profile}")
+
+        prepared = await self._prepare_single_asset_analysis(request, user)
+        provider = self._get_provider(AIProviderType.ANTHROPIC)
+
+        async def _events() -> AsyncIterator[bytes]:
+            # Texte accumulé pour le parsing JSON final
+            chunks: List[str] = []
+
+            async for event in provider.analyze_stream(
+                prompt=prepared["user_prompt"],
+                system_prompt=prepared["system_prompt"],
+                model=request.model.value,
+                max_tokens=self.max_tokens,
+                temperature=0.3,
+                api_key=prepared["api_key"],
+                cached_prefix=prepared["cached_prefix"]
+            ):
+                if event["type"] == "delta":
+                    chunks.append(event["text"])
+                    yield _sse_frame("delta", orjson.dumps({"text": event["text"]}))
+
+                elif event["type"] == "error":
+                    logger.error(f"Erreur analyse single-asset (stream) {request_id}: {event['message']}")
+                    yield _sse_frame("error", orjson.dumps({"message": event["message"]}))
+                    return
+
+                elif event["type"] == "done":
+                    response = self._build_analysis_response(
+                        request,
+                        request_id,
+                        start_time,
+                        prepared["technical_data"],
+                        "".join(chunks).strip(),
+                        event["tokens_used"]
+                    )
+                    yield _sse_frame("final", response.model_dump_json().encode())
+
+        return _events()
+
     # ═══════════════════════════════════════════════════════════════
     # UTILITAIRES
     # ═══════════════════════════════════════════════════════════════
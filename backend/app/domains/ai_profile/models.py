@@ -106,6 +106,9 @@ class AIProfile(Base):
         Index('idx_user_provider', 'user_id', 'preferred_provider'),
     )
 
+    # created_at / updated_at récupérés par RETURNING lors du flush (pas de refresh)
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<AIProfile(user_id={self.user_id}, provider={self.preferred_provider}, model={self.preferred_model})>"
 
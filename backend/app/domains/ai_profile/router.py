@@ -3,10 +3,10 @@ Router pour la gestion des profils IA utilisateur
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from ...core import get_db, get_current_user
+from ...core import get_async_db, get_async_current_user
 from ...domains.auth.models import User
 
 from .schemas import (
@@ -27,8 +27,8 @@ ai_profile_service = AIProfileService()
 
 @router.get("/me", response_model=AIProfileResponse)
 async def get_my_ai_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Récupère le profil IA de l'utilisateur actuel
@@ -38,9 +38,9 @@ async def get_my_ai_profile(
     try:
         logger.info(f"Récupération profil IA pour utilisateur {current_user.id}")
 
-        profile = ai_profile_service.get_or_create_profile(current_user.id, db)
+        profile = await ai_profile_service.get_or_create_profile(current_user.id, db)
 
-        return AIProfileResponse.from_orm(profile)
+        return AIProfileResponse.model_validate(profile)
 
     except Exception as e:
         logger.error(f"Erreur récupération profil IA utilisateur {current_user.id}: {e}")
@@ -53,8 +53,8 @@ async def get_my_ai_profile(
 @router.put("/me", response_model=AIProfileResponse)
 async def update_my_ai_profile(
     profile_data: AIProfileUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Met à jour le profil IA de l'utilisateur actuel
@@ -65,10 +65,10 @@ async def update_my_ai_profile(
         logger.info(f"Mise à jour profil IA pour utilisateur {current_user.id}")
 
         # S'assurer que le profil existe
-        ai_profile_service.get_or_create_profile(current_user.id, db)
+        await ai_profile_service.get_or_create_profile(current_user.id, db)
 
         # Mettre à jour le profil
-        updated_profile = ai_profile_service.update_profile(
+        updated_profile = await ai_profile_service.update_profile(
             current_user.id,
             profile_data,
             db
@@ -76,7 +76,7 @@ async def update_my_ai_profile(
 
         logger.info(f"Profil IA mis à jour avec succès pour utilisateur {current_user.id}")
 
-        return AIProfileResponse.from_orm(updated_profile)
+        return AIProfileResponse.model_validate(updated_profile)
 
     except ValueError as ve:
         logger.warning(f"Erreur métier mise à jour profil IA utilisateur {current_user.id}: {ve}")
@@ -96,8 +96,8 @@ async def update_my_ai_profile(
 @router.post("/me", response_model=AIProfileResponse)
 async def create_my_ai_profile(
     profile_data: AIProfileCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Crée un profil IA pour l'utilisateur actuel
@@ -107,7 +107,7 @@ async def create_my_ai_profile(
     try:
         logger.info(f"Création profil IA pour utilisateur {current_user.id}")
 
-        profile = ai_profile_service.create_profile(
+        profile = await ai_profile_service.create_profile(
             current_user.id,
             profile_data,
             db
@@ -115,7 +115,7 @@ async def create_my_ai_profile(
 
         logger.info(f"Profil IA créé avec succès pour utilisateur {current_user.id}")
 
-        return AIProfileResponse.from_orm(profile)
+        return AIProfileResponse.model_validate(profile)
 
     except ValueError as ve:
         logger.warning(f"Erreur création profil IA utilisateur {current_user.id}: {ve}")
@@ -134,8 +134,8 @@ async def create_my_ai_profile(
 
 @router.delete("/me")
 async def reset_my_ai_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Reset le profil IA de l'utilisateur aux valeurs par défaut
@@ -145,13 +145,13 @@ async def reset_my_ai_profile(
     try:
         logger.info(f"Reset profil IA pour utilisateur {current_user.id}")
 
-        profile = ai_profile_service.reset_to_defaults(current_user.id, db)
+        profile = await ai_profile_service.reset_to_defaults(current_user.id, db)
 
         logger.info(f"Profil IA reset avec succès pour utilisateur {current_user.id}")
 
         return {
             "message": "Profil IA reset aux valeurs par défaut",
-            "profile": AIProfileResponse.from_orm(profile)
+            "profile": AIProfileResponse.model_validate(profile)
         }
 
     except Exception as e:
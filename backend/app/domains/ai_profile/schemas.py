@@ -2,7 +2,7 @@
 Schémas Pydantic pour le profil IA utilisateur
 """
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, Literal
 from datetime import datetime
 
@@ -92,8 +92,7 @@ class AIProfileResponse(AIProfileBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AIProfileValidationInfo(BaseModel):
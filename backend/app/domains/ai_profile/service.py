@@ -3,7 +3,8 @@ Service métier pour la gestion des profils IA utilisateur
 """
 
 import logging
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from .models import AIProfile
@@ -12,23 +13,28 @@ from .schemas import AIProfileCreate, AIProfileUpdate, AIProfileResponse
 logger = logging.getLogger(__name__)
 
 
+def _profile_statement(user_id: int):
+    """Requête du profil IA d'un utilisateur (index unique sur user_id)"""
+    return select(AIProfile).where(AIProfile.user_id == user_id)
+
+
 class AIProfileService:
     """Service pour gérer les profils IA utilisateur"""
 
-    def get_or_create_profile(self, user_id: int, db: Session) -> AIProfile:
+    async def get_or_create_profile(self, user_id: int, db: AsyncSession) -> AIProfile:
         """
         Récupère le profil IA de l'utilisateur ou en crée un nouveau avec valeurs par défaut
 
         Args:
             user_id: ID de l'utilisateur
-            db: Session de base de données
+            db: Session de base de données asynchrone
 
         Returns:
             Profil IA de l'utilisateur
         """
         try:
             # Vérifier si le profil existe déjà
-            profile = db.query(AIProfile).filter(AIProfile.user_id == user_id).first()
+            profile = await db.scalar(_profile_statement(user_id))
 
             if profile:
                 logger.info(f"Profil IA existant récupéré pour utilisateur {user_id}")
@@ -42,41 +48,40 @@ class AIProfileService:
             )
 
             db.add(new_profile)
-            db.commit()
-            db.refresh(new_profile)
+            await db.commit()
 
             logger.info(f"Nouveau profil IA créé pour utilisateur {user_id}")
             return new_profile
 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur get_or_create_profile pour utilisateur {user_id}: {e}")
             raise
 
-    def get_profile(self, user_id: int, db: Session) -> Optional[AIProfile]:
+    async def get_profile(self, user_id: int, db: AsyncSession) -> Optional[AIProfile]:
         """
         Récupère le profil IA de l'utilisateur
 
         Args:
             user_id: ID de l'utilisateur
-            db: Session de base de données
+            db: Session de base de données asynchrone
 
         Returns:
             Profil IA ou None si non trouvé
         """
         try:
-            profile = db.query(AIProfile).filter(AIProfile.user_id == user_id).first()
+            profile = await db.scalar(_profile_statement(user_id))
             return profile
 
         except Exception as e:
             logger.error(f"Erreur get_profile pour utilisateur {user_id}: {e}")
             raise
 
-    def create_profile(
+    async def create_profile(
         self,
         user_id: int,
         profile_data: AIProfileCreate,
-        db: Session
+        db: AsyncSession
     ) -> AIProfile:
         """
         Crée un nouveau profil IA pour l'utilisateur
@@ -84,7 +89,7 @@ class AIProfileService:
         Args:
             user_id: ID de l'utilisateur
             profile_data: Données du profil
-            db: Session de base de données
+            db: Session de base de données asynchrone
 
         Returns:
             Profil IA créé
@@ -94,33 +99,32 @@ class AIProfileService:
         """
         try:
             # Vérifier qu'il n'existe pas déjà
-            existing = db.query(AIProfile).filter(AIProfile.user_id == user_id).first()
+            existing = await db.scalar(_profile_statement(user_id))
             if existing:
                 raise ValueError("Un profil IA existe déjà pour cet utilisateur")
 
             # Créer le nouveau profil
             new_profile = AIProfile(
                 user_id=user_id,
-                **profile_data.dict()
+                **profile_data.model_dump()
             )
 
             db.add(new_profile)
-            db.commit()
-            db.refresh(new_profile)
+            await db.commit()
 
             logger.info(f"Profil IA créé pour utilisateur {user_id}")
             return new_profile
 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur create_profile pour utilisateur {user_id}: {e}")
             raise
 
-    def update_profile(
+    async def update_profile(
         self,
         user_id: int,
         profile_data: AIProfileUpdate,
-        db: Session
+        db: AsyncSession
     ) -> AIProfile:
         """
         Met à jour le profil IA de l'utilisateur
@@ -128,7 +132,7 @@ class AIProfileService:
         Args:
             user_id: ID de l'utilisateur
             profile_data: Données à mettre à jour
-            db: Session de base de données
+            db: Session de base de données asynchrone
 
         Returns:
             Profil IA mis à jour
@@ -138,74 +142,73 @@ class AIProfileService:
         """
         try:
             # Récupérer le profil existant
-            profile = db.query(AIProfile).filter(AIProfile.user_id == user_id).first()
+            profile = await db.scalar(_profile_statement(user_id))
 
             if not profile:
                 raise ValueError("Aucun profil IA trouvé pour cet utilisateur")
 
             # Mettre à jour uniquement les champs fournis
-            update_data = profile_data.dict(exclude_unset=True)
+            update_data = profile_data.model_dump(exclude_unset=True)
 
             for field, value in update_data.items():
                 setattr(profile, field, value)
 
-            db.commit()
-            db.refresh(profile)
+            await db.commit()
 
             logger.info(f"Profil IA mis à jour pour utilisateur {user_id}")
             return profile
 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur update_profile pour utilisateur {user_id}: {e}")
             raise
 
-    def delete_profile(self, user_id: int, db: Session) -> bool:
+    async def delete_profile(self, user_id: int, db: AsyncSession) -> bool:
         """
         Supprime le profil IA de l'utilisateur (reset aux valeurs par défaut)
 
         Args:
             user_id: ID de l'utilisateur
-            db: Session de base de données
+            db: Session de base de données asynchrone
 
         Returns:
             True si supprimé avec succès
         """
         try:
-            profile = db.query(AIProfile).filter(AIProfile.user_id == user_id).first()
+            profile = await db.scalar(_profile_statement(user_id))
 
             if not profile:
                 logger.warning(f"Aucun profil IA à supprimer pour utilisateur {user_id}")
                 return False
 
-            db.delete(profile)
-            db.commit()
+            await db.delete(profile)
+            await db.commit()
 
             logger.info(f"Profil IA supprimé pour utilisateur {user_id}")
             return True
 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Erreur delete_profile pour utilisateur {user_id}: {e}")
             raise
 
-    def reset_to_defaults(self, user_id: int, db: Session) -> AIProfile:
+    async def reset_to_defaults(self, user_id: int, db: AsyncSession) -> AIProfile:
         """
         Reset le profil IA aux valeurs par défaut
 
         Args:
             user_id: ID de l'utilisateur
-            db: Session de base de données
+            db: Session de base de données asynchrone
 
         Returns:
             Profil IA avec valeurs par défaut
         """
         try:
             # Supprimer le profil existant
-            self.delete_profile(user_id, db)
+            await self.delete_profile(user_id, db)
 
             # Créer un nouveau profil avec valeurs par défaut
-            return self.get_or_create_profile(user_id, db)
+            return await self.get_or_create_profile(user_id, db)
 
         except Exception as e:
             logger.error(f"Erreur reset_to_defaults pour utilisateur {user_id}: {e}")
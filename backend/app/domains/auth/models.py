@@ -2,7 +2,7 @@
 Modèles pour le domaine auth - Authentification uniquement
 """
 
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ...core import Base
@@ -32,3 +32,19 @@ class User(Base):
     # Relations (définie ici, mais les modèles cibles sont dans users/ et ai_profile/)
     profile = relationship("UserProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
     ai_profile = relationship("AIProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
+
+
+class RefreshToken(Base):
+    """
+    Refresh token opaque (un par session active)
+
+    Seule l'empreinte SHA-256 du token est stockée : le refresh est une
+    suppression par clé primaire (rotation atomique), la déconnexion révoque
+    immédiatement, sans vérification de signature JWT.
+    """
+    __tablename__ = "refresh_tokens"
+
+    token_hash = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
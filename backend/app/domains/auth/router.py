@@ -6,6 +6,7 @@ Router pour le domaine auth - Endpoints d'authentification
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from sqlalchemy.orm import Session
+import asyncio
 
 from .schemas import UserRegister, UserLogin, Token, TokenRefresh, UserAuthResponse
 from .service import AuthService
@@ -25,8 +26,11 @@ async def register(
     Inscription utilisateur avec système hybride :
     - Access token retourné dans JSON (localStorage client)
     - Refresh token stocké dans cookie HttpOnly (sécurité SSR)
+
+    Le hachage bcrypt (CPU) et la session synchrone bloqueraient la boucle
+    asyncio : le service s'exécute dans un thread (bcrypt libère le GIL).
     """
-    return AuthService.register(db, user_data, response)
+    return await asyncio.to_thread(AuthService.register, db, user_data, response)
 
 
 @router.post("/login", response_model=Token)
@@ -39,8 +43,10 @@ async def login(
     Authentification utilisateur avec système hybride :
     - Access token retourné dans JSON (localStorage client)
     - Refresh token stocké dans cookie HttpOnly (sécurité SSR)
+
+    La vérification bcrypt s'exécute hors de la boucle asyncio (voir register).
     """
-    return AuthService.login(db, credentials, response)
+    return await asyncio.to_thread(AuthService.login, db, credentials, response)
 
 
 @router.post("/refresh", response_model=Token)
@@ -70,26 +76,34 @@ async def refresh(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    try:
-        return AuthService.refresh_tokens(refresh_token_value, response, db)
-    except HTTPException as e:
-        # Supprimer cookie invalide si présent
-        if request.cookies.get("refresh_token"):
-            response.delete_cookie(key="refresh_token", path="/")
-        raise e
+    # Session synchrone : hors de la boucle asyncio.
+    # Pas de suppression du cookie sur 401 : un token refusé peut venir d'une
+    # rotation concurrente (token déjà consommé par une autre requête) et
+    # effacer le cookie supprimerait celui qui vient d'être émis. Un token
+    # refusé ne correspond à aucune session ; login/logout le remplacent.
+    return await asyncio.to_thread(AuthService.refresh_tokens, refresh_token_value, response, db)
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    token_data: TokenRefresh = None
+):
     """
     Déconnexion utilisateur avec système hybride :
+    - Révoque le refresh token en base (invalidation immédiate)
+    - Accepte refresh_token depuis cookie HttpOnly OU body JSON (comme /refresh)
     - Supprime le cookie refresh_token HttpOnly
     - Le client doit également supprimer localStorage (géré côté frontend)
-
-    Note : Dans une implémentation complète avec blacklist, on ajouterait
-    les tokens révoqués en base/cache (Redis) pour invalidation immédiate.
     """
-    return AuthService.logout(response)
+    # Priorité au cookie, fallback au body (clients sans cookies)
+    refresh_token_value = request.cookies.get("refresh_token")
+    if not refresh_token_value and token_data:
+        refresh_token_value = token_data.refresh_token
+
+    return await asyncio.to_thread(AuthService.logout, response, db, refresh_token_value)
 
 
 @router.get("/me", response_model=UserAuthResponse)
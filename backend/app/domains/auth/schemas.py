@@ -2,7 +2,7 @@
 Schémas Pydantic pour le domaine auth - Authentification et tokens JWT
 """
 
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 from typing import Optional
 
 
@@ -55,5 +55,4 @@ class UserAuthResponse(BaseModel):
     email: EmailStr
     username: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -2,23 +2,42 @@
 Service pour le domaine auth - Logique métier de l'authentification
 """
 
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status, Response
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 from typing import Optional
+import hashlib
+import secrets
 
-from .models import User
+from .models import User, RefreshToken
 from .schemas import UserRegister, UserLogin, Token
 from ...core import (
     get_password_hash,
     verify_password,
     create_access_token,
-    create_refresh_token,
-    verify_token,
     settings
 )
 
 
+# Attributs du cookie refresh_token, construits une seule fois
+_REFRESH_COOKIE = {
+    "key": "refresh_token",
+    "httponly": True,
+    "secure": False,  # TODO: True en production (HTTPS uniquement)
+    "samesite": "lax",
+    "max_age": 7 * 24 * 60 * 60,  # 7 jours
+    "path": "/",
+}
+
+_REFRESH_COOKIE_DELETE = {
+    "key": "refresh_token",
+    "path": "/",
+    "httponly": True,
+    "samesite": "lax",
+}
+
+
 def set_refresh_token_cookie(response: Response, refresh_token: str) -> None:
     """
     Helper pour configurer le cookie refresh_token HttpOnly
@@ -29,15 +48,7 @@ def set_refresh_token_cookie(response: Response, refresh_token: str) -> None:
         response: Objet Response FastAPI
         refresh_token: Token de rafraîchissement à stocker
     """
-    response.set_cookie(
-        key="refresh_token",
-        value=refresh_token,
-        httponly=True,
-        secure=False,  # TODO: True en production (HTTPS uniquement)
-        samesite="lax",
-        max_age=7 * 24 * 60 * 60,  # 7 jours
-        path="/",
-    )
+    response.set_cookie(value=refresh_token, **_REFRESH_COOKIE)
 
 
 def clear_refresh_token_cookie(response: Response) -> None:
@@ -47,17 +58,46 @@ def clear_refresh_token_cookie(response: Response) -> None:
     Args:
         response: Objet Response FastAPI
     """
-    response.delete_cookie(
-        key="refresh_token",
-        path="/",
-        httponly=True,
-        samesite="lax"
-    )
+    response.delete_cookie(**_REFRESH_COOKIE_DELETE)
+
+
+def _hash_refresh_token(refresh_token: str) -> str:
+    """Empreinte stockée en base (le token en clair n'est jamais persisté)"""
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
 
 
 class AuthService:
     """Service de gestion de l'authentification"""
 
+    @staticmethod
+    def _issue_tokens(db: Session, user_id: int, response: Response) -> Token:
+        """
+        Crée un access token JWT et un refresh token opaque
+
+        Le refresh token est ajouté à la session : l'appelant commit.
+
+        Args:
+            db: Session de base de données
+            user_id: ID de l'utilisateur
+            response: Objet Response pour les cookies
+
+        Returns:
+            Token: Access et refresh tokens
+        """
+        access_token = create_access_token(data={"sub": str(user_id)})
+        refresh_token = secrets.token_urlsafe(32)
+
+        db.add(RefreshToken(
+            token_hash=_hash_refresh_token(refresh_token),
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=settings.jwt_refresh_token_expire_days)
+        ))
+
+        # Stocker refresh_token dans cookie HttpOnly
+        set_refresh_token_cookie(response, refresh_token)
+
+        return Token(access_token=access_token, refresh_token=refresh_token)
+
     @staticmethod
     def register(db: Session, user_data: UserRegister, response: Response) -> Token:
         """
@@ -74,13 +114,16 @@ class AuthService:
         Raises:
             HTTPException: Si l'email ou le username existe déjà
         """
-        # Vérifier si l'utilisateur existe déjà
-        existing_user = db.query(User).filter(
-            (User.email == user_data.email) | (User.username == user_data.username)
-        ).first()
+        # Vérifier si l'utilisateur existe déjà : deux lookups sur index unique
+        # (UNION ALL) plutôt qu'un OR, seul l'email de la ligne trouvée est lu
+        existing_email = db.scalar(
+            select(User.email).where(User.email == user_data.email)
+            .union_all(select(User.email).where(User.username == user_data.username))
+            .limit(1)
+        )
 
-        if existing_user:
-            if existing_user.email == user_data.email:
+        if existing_email is not None:
+            if existing_email == user_data.email:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Email already registered"
@@ -98,20 +141,16 @@ class AuthService:
             hashed_password=get_password_hash(user_data.password)
         )
         db.add(db_user)
+        db.flush()
+
+        # Créer les tokens (utilisateur et session dans la même transaction)
+        token = AuthService._issue_tokens(db, db_user.id, response)
         db.commit()
-        db.refresh(db_user)
 
-        # Créer les tokens
-        access_token = create_access_token(data={"sub": str(db_user.id)})
-        refresh_token = create_refresh_token(data={"sub": str(db_user.id)})
-
-        # Stocker refresh_token dans cookie HttpOnly
-        set_refresh_token_cookie(response, refresh_token)
-
-        return Token(access_token=access_token, refresh_token=refresh_token)
+        return token
 
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> User:
+    def authenticate_user(db: Session, email: str, password: str) -> int:
         """
         Authentifie un utilisateur par email et mot de passe
 
@@ -121,12 +160,15 @@ class AuthService:
             password: Mot de passe en clair
 
         Returns:
-            User: Utilisateur authentifié
+            int: ID de l'utilisateur authentifié
 
         Raises:
             HTTPException: Si les credentials sont incorrects
         """
-        user = db.query(User).filter(User.email == email).first()
+        # Seules les colonnes utiles : pas d'objet ORM matérialisé
+        user = db.execute(
+            select(User.id, User.hashed_password).where(User.email == email)
+        ).first()
 
         if not user or not verify_password(password, user.hashed_password):
             raise HTTPException(
@@ -135,7 +177,7 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return user
+        return user.id
 
     @staticmethod
     def login(db: Session, credentials: UserLogin, response: Response) -> Token:
@@ -151,16 +193,21 @@ class AuthService:
             Token: Access et refresh tokens
         """
         # Authentifier l'utilisateur
-        user = AuthService.authenticate_user(db, credentials.email, credentials.password)
+        user_id = AuthService.authenticate_user(db, credentials.email, credentials.password)
 
-        # Créer les tokens
-        access_token = create_access_token(data={"sub": str(user.id)})
-        refresh_token = create_refresh_token(data={"sub": str(user.id)})
+        # Purger les sessions expirées de l'utilisateur (index sur user_id)
+        db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.expires_at <= datetime.now(timezone.utc)
+            )
+        )
 
-        # Stocker refresh_token dans cookie HttpOnly
-        set_refresh_token_cookie(response, refresh_token)
+        # Créer les tokens
+        token = AuthService._issue_tokens(db, user_id, response)
+        db.commit()
 
-        return Token(access_token=access_token, refresh_token=refresh_token)
+        return token
 
     @staticmethod
     def refresh_tokens(refresh_token: str, response: Response, db: Session) -> Token:
@@ -178,60 +225,53 @@ class AuthService:
         Raises:
             HTTPException: Si le token est invalide ou expiré
         """
-        try:
-            # Vérifier le refresh token (type="refresh" pour refresh tokens)
-            payload = verify_token(refresh_token, token_type="refresh")
-
-            if payload.get("type") != "refresh":
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token type"
-                )
-
-            user_id = payload.get("user_id")
-            if user_id is None:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Could not validate credentials"
-                )
-
-            # Vérifier que l'utilisateur existe toujours
-            user = db.query(User).filter(User.id == int(user_id)).first()
-            if not user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User not found"
-                )
-
-            # Créer de nouveaux tokens
-            new_access_token = create_access_token(data={"sub": str(user_id)})
-            new_refresh_token = create_refresh_token(data={"sub": str(user_id)})
-
-            # Stocker le nouveau refresh_token dans cookie HttpOnly
-            set_refresh_token_cookie(response, new_refresh_token)
+        # Rotation atomique : le token consommé est supprimé et l'utilisateur
+        # lu dans la même instruction (clé primaire, pas de vérification JWT).
+        # La FK ON DELETE CASCADE garantit que l'utilisateur existe toujours.
+        user_id = db.scalar(
+            delete(RefreshToken)
+            .where(
+                RefreshToken.token_hash == _hash_refresh_token(refresh_token),
+                RefreshToken.expires_at > datetime.now(timezone.utc)
+            )
+            .returning(RefreshToken.user_id)
+        )
 
-            return Token(access_token=new_access_token, refresh_token=new_refresh_token)
-        except HTTPException:
-            # Re-raise les HTTPException (déjà avec le bon status code)
-            raise
-        except Exception as e:
-            # Toute autre erreur → 401
+        if user_id is None:
+            db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Token refresh failed: {str(e)}"
+                detail="Invalid or expired refresh token"
             )
 
+        # Créer de nouveaux tokens
+        token = AuthService._issue_tokens(db, user_id, response)
+        db.commit()
+
+        return token
+
     @staticmethod
-    def logout(response: Response) -> dict:
+    def logout(response: Response, db: Session, refresh_token: Optional[str] = None) -> dict:
         """
         Déconnexion de l'utilisateur
 
         Args:
             response: Objet Response pour supprimer les cookies
+            db: Session de base de données
+            refresh_token: Refresh token de la session à révoquer
 
         Returns:
             dict: Message de confirmation
         """
+        # Révoquer la session : le refresh token n'est plus utilisable
+        if refresh_token:
+            db.execute(
+                delete(RefreshToken).where(
+                    RefreshToken.token_hash == _hash_refresh_token(refresh_token)
+                )
+            )
+            db.commit()
+
         # Supprimer le cookie refresh_token
         clear_refresh_token_cookie(response)
 
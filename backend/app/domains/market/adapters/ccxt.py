@@ -96,6 +96,11 @@ class CCXTAdapter:
         """
         return self.profile_configs.get(profile)
 
+    @staticmethod
+    def timeframe_seconds(timeframe: str) -> int:
+        """Durée d'une bougie en secondes (ex: '15m' -> 900)"""
+        return ccxt.Exchange.parse_timeframe(timeframe)
+
     async def get_exchange_symbols(self, exchange_name: str, limit: int = 20) -> Dict[str, Any]:
         """
         Récupère les symboles populaires d'un exchange
@@ -215,35 +220,41 @@ class CCXTAdapter:
                     "message": f"Symbole '{symbol}' non trouvé sur {exchange_name}. Symboles disponibles limités aux paires avec USDT, USDC, BTC."
                 }
 
-            # Récupérer les données OHLCV pour les 3 timeframes
-            main_data = await self._fetch_ohlcv_async(exchange, normalized_symbol, main_tf, limit)
-            higher_data = await self._fetch_ohlcv_async(exchange, normalized_symbol, higher_tf, limit)
-            lower_data = await self._fetch_ohlcv_async(exchange, normalized_symbol, lower_tf, limit)
-
-            # Récupérer le prix actuel via ticker
-            current_price_info = None
-            try:
-                if exchange.has['fetchTicker']:
-                    ticker = await self._fetch_ticker_async(exchange, normalized_symbol)
+            # Récupérer les 3 timeframes et le ticker en parallèle (appels réseau
+            # indépendants, chacun dans un thread de l'executor)
+            has_ticker = exchange.has['fetchTicker']
+            fetches = [
+                self._fetch_ohlcv_async(exchange, normalized_symbol, main_tf, limit),
+                self._fetch_ohlcv_async(exchange, normalized_symbol, higher_tf, limit),
+                self._fetch_ohlcv_async(exchange, normalized_symbol, lower_tf, limit),
+            ]
+            if has_ticker:
+                fetches.append(self._fetch_ticker_async(exchange, normalized_symbol))
+
+            results = await asyncio.gather(*fetches, return_exceptions=True)
+
+            # Une erreur OHLCV fait échouer la requête, une erreur ticker est tolérée
+            for result in results[:3]:
+                if isinstance(result, BaseException):
+                    raise result
+            main_data, higher_data, lower_data = results[:3]
+
+            # Prix actuel via ticker, sinon prix de fermeture de la dernière bougie
+            current_price_info = {
+                "current_price": main_data[-1][4] if main_data else 0,
+                "change_24h_percent": None,
+                "volume_24h": None
+            }
+            if has_ticker:
+                ticker = results[3]
+                if isinstance(ticker, BaseException):
+                    logger.warning(f"Impossible de récupérer le prix actuel: {ticker}")
+                else:
                     current_price_info = {
-                        "current_price": ticker['last'] if ticker['last'] else (main_data[-1][4] if main_data else 0),
+                        "current_price": ticker.get('last') or (main_data[-1][4] if main_data else 0),
                         "change_24h_percent": ticker.get('percentage'),
                         "volume_24h": ticker.get('baseVolume')
                     }
-                else:
-                    # Fallback au prix de fermeture de la dernière bougie
-                    current_price_info = {
-                        "current_price": main_data[-1][4] if main_data else 0,
-                        "change_24h_percent": None,
-                        "volume_24h": None
-                    }
-            except Exception as e:
-                logger.warning(f"Impossible de récupérer le prix actuel: {e}")
-                current_price_info = {
-                    "current_price": main_data[-1][4] if main_data else 0,
-                    "change_24h_percent": None,
-                    "volume_24h": None
-                }
 
             # Fermer la connexion
             if hasattr(exchange, 'close'):
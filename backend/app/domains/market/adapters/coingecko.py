@@ -107,7 +107,8 @@ class CoinGeckoAdapter:
         except asyncio.TimeoutError:
             return {
                 "status": "error",
-                "message": "Timeout lors de la connexion à l'API CoinGecko"
+                "message": "Timeout lors de la connexion à l'API CoinGecko",
+                "timeout": True
             }
 
         except Exception as e:
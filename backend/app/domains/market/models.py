@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Index
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from ...core import Base
 
@@ -26,7 +27,8 @@ class MarketData(Base):
     source_id = Column(String(100), nullable=True)  # ID source spécifique (ex: coin_id CoinGecko)
 
     # Métadonnées
-    raw_data = Column(Text, nullable=True)  # JSON des données brutes pour debug
+    # Différé : JSON volumineux jamais lu par les listes, chargé seulement à l'accès
+    raw_data = deferred(Column(Text, nullable=True))  # JSON des données brutes pour debug
 
     # Timestamps
     data_timestamp = Column(DateTime(timezone=True), nullable=False)  # Timestamp des données
@@ -35,7 +37,17 @@ class MarketData(Base):
 
     # Index composé pour optimiser les requêtes par symbole et timestamp
     __table_args__ = (
-        Index('idx_symbol_timestamp', 'symbol', 'data_timestamp'),
+        # Couvrant : le dernier prix/volume d'un symbole est lu sans accès à la table
+        Index(
+            'idx_symbol_ts_cover', 'symbol', 'data_timestamp',
+            postgresql_include=['price_usd', 'volume_24h_usd']
+        ),
         Index('idx_source_timestamp', 'source', 'data_timestamp'),
         Index('idx_symbol_source', 'symbol', 'source'),
+        # BRIN : table en ajout seul, ordre physique corrélé au timestamp (plages de dates)
+        Index(
+            'idx_market_data_ts_brin', 'data_timestamp',
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32}
+        ),
     )
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 from datetime import datetime, timedelta
 import logging
 
-from ...core import get_db, get_current_user
+from ...core import get_db, get_current_user, get_current_user_id, SessionLocal
 from ...domains.auth.models import User
 from .models import MarketData
+from .schemas import MarketData as MarketDataSchema
 from .schemas import (
     # Market Data
     MarketDataResponse,
@@ -254,17 +256,15 @@ async def get_historical_data(
     try:
         symbol = symbol.upper()
 
+        # Limite appliquée en SQL
         historical_data = await market_service.get_historical_data(
             db=db,
             symbol=symbol,
             hours_back=hours_back,
-            source=source
+            source=source,
+            limit=limit
         )
 
-        # Limiter les résultats
-        if len(historical_data) > limit:
-            historical_data = historical_data[:limit]
-
         return MarketDataResponse(
             status="success",
             message=f"Historique récupéré pour {symbol} ({len(historical_data)} entrées)",
@@ -276,6 +276,31 @@ async def get_historical_data(
         logger.error(f"Erreur récupération historique pour {symbol}: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur interne: {str(e)}")
 
+@router.get("/data/{symbol}/history.ndjson")
+async def stream_historical_data(
+    symbol: str,
+    hours_back: int = Query(default=24, le=168, description="Heures d'historique (max 168h = 7 jours)"),
+    source: Optional[str] = Query(default=None, description="Filtrer par source"),
+    limit: int = Query(default=100, le=1000, description="Nombre max d'entrées"),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    Historique d'un symbole en NDJSON (une entrée JSON par ligne)
+
+    Les lignes sont envoyées au fil de la lecture (curseur serveur) : le premier
+    octet part dès la première ligne et la mémoire reste constante quel que soit
+    `limit`.
+    """
+    stmt = MarketService.historical_data_statement(symbol, hours_back, source, limit)
+
+    def _rows() -> Iterator[bytes]:
+        # Session propre au flux : celle de get_db est fermée avant l'envoi du corps
+        with SessionLocal() as session:
+            for row in session.scalars(stmt.execution_options(yield_per=100)):
+                yield MarketDataSchema.model_validate(row).model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(_rows(), media_type="application/x-ndjson")
+
 @router.post("/data/batch", response_model=MarketDataBatchResponse)
 async def get_batch_market_data(
     batch_request: MarketDataBatch,
@@ -1,15 +1,16 @@
 import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+import time
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import Select, and_, desc, select
 import logging
 
 from .adapters import CCXTAdapter, CoinGeckoAdapter
 from .models import MarketData
 from .schemas import ClaudeMarketData
 from ...domains.auth.models import User
-from ...core import decrypt_api_key
+from ...core import decrypt_api_key_cached, TTLCache
 from ...shared import (
     calculate_rsi,
     calculate_atr,
@@ -19,6 +20,12 @@ from ...shared import (
 
 logger = logging.getLogger(__name__)
 
+# Analyses multi-timeframes partagées entre utilisateurs (et instances du service).
+# Clé : (exchange, symbole, profil, bougie en cours du plus petit timeframe) ->
+# une nouvelle bougie change la clé ; le TTL borne l'âge du prix ticker inclus.
+_TECHNICAL_DATA_TTL = 60
+_technical_data_cache = TTLCache(ttl=_TECHNICAL_DATA_TTL, max_size=512)
+
 class MarketService:
     """Service unifié pour les données de marché et l'analyse technique"""
 
@@ -145,6 +152,35 @@ class MarketService:
         Returns:
             Dict contenant l'analyse multi-timeframes complète
         """
+        cache_key = None
+        config = self.ccxt_adapter.get_profile_config(profile)
+        if config:
+            lower_tf_seconds = self.ccxt_adapter.timeframe_seconds(config["lower"])
+            cache_key = (
+                exchange_name.lower(),
+                symbol.upper(),
+                profile,
+                int(time.time()) // lower_tf_seconds
+            )
+            cached = _technical_data_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        analysis = await self._compute_multi_timeframe_analysis(exchange_name, symbol, profile)
+
+        # Seules les analyses réussies sont partagées
+        if cache_key is not None and analysis.get("status") != "error":
+            _technical_data_cache.set(cache_key, analysis)
+
+        return analysis
+
+    async def _compute_multi_timeframe_analysis(
+        self,
+        exchange_name: str,
+        symbol: str,
+        profile: str
+    ) -> Dict[str, Any]:
+        """Récupère les OHLCV via CCXT et calcule les indicateurs (sans cache)"""
         try:
             # 1. Récupérer les données OHLCV via CCXTAdapter
             ohlcv_result = await self.ccxt_adapter.fetch_multi_timeframe_ohlcv(
@@ -384,7 +420,7 @@ class MarketService:
                     "message": "Clé API CoinGecko non configurée"
                 }
 
-            api_key = decrypt_api_key(user.coingecko_api_key)
+            api_key = decrypt_api_key_cached(user.coingecko_api_key)
 
             # Convertir le symbole en ID CoinGecko
             coin_id = self.symbol_to_id_mapping.get(symbol.upper(), symbol.lower())
@@ -521,26 +557,39 @@ class MarketService:
                 "message": f"Erreur interne: {str(e)}"
             }
 
+    @staticmethod
+    def historical_data_statement(
+        symbol: str,
+        hours_back: int = 24,
+        source: Optional[str] = None,
+        limit: int = 1000
+    ) -> Select:
+        """Requête de l'historique d'un symbole (plus récent d'abord, limite appliquée en SQL)"""
+        stmt = select(MarketData).where(
+            and_(
+                MarketData.symbol == symbol.upper(),
+                MarketData.data_timestamp >= datetime.utcnow() - timedelta(hours=hours_back)
+            )
+        )
+
+        if source:
+            stmt = stmt.where(MarketData.source == source)
+
+        return stmt.order_by(desc(MarketData.data_timestamp)).limit(limit)
+
     async def get_historical_data(
         self,
         db: Session,
         symbol: str,
         hours_back: int = 24,
-        source: Optional[str] = None
+        source: Optional[str] = None,
+        limit: int = 1000
     ) -> List[MarketData]:
         """Récupère les données historiques pour un symbole"""
         try:
-            query = db.query(MarketData).filter(
-                and_(
-                    MarketData.symbol == symbol.upper(),
-                    MarketData.data_timestamp >= datetime.utcnow() - timedelta(hours=hours_back)
-                )
-            )
-
-            if source:
-                query = query.filter(MarketData.source == source)
-
-            return query.order_by(desc(MarketData.data_timestamp)).limit(1000).all()
+            return db.scalars(
+                self.historical_data_statement(symbol, hours_back, source, limit)
+            ).all()
 
         except Exception as e:
             logger.error(f"Erreur récupération historique pour {symbol}: {e}")
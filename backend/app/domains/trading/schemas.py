@@ -1,9 +1,10 @@
 """Schémas Pydantic pour le domaine trading"""
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, Literal, List, Tuple
+from pydantic import BaseModel, Field, StringConstraints, field_validator, field_serializer
+from typing import Annotated, Optional, Literal, List, Tuple, Union
 from datetime import datetime
 from enum import Enum
+import time
 
 
 # =============================================================================
@@ -29,7 +30,9 @@ class HyperliquidOrderType(str, Enum):
 class ExecuteTradeRequest(BaseModel):
     """Requête d'exécution de trade complet sur Hyperliquid"""
 
-    symbol: str = Field(..., description="Symbole à trader (ex: BTC)")
+    symbol: Annotated[
+        str, StringConstraints(strip_whitespace=True, to_upper=True, min_length=2)
+    ] = Field(..., description="Symbole à trader (ex: BTC), normalisé en majuscules")
     direction: Literal["long", "short"] = Field(..., description="Direction du trade")
     entry_price: float = Field(..., description="Prix d'entrée")
     stop_loss: float = Field(..., description="Prix de stop-loss")
@@ -40,12 +43,6 @@ class ExecuteTradeRequest(BaseModel):
     use_testnet: bool = Field(default=False, description="Utiliser le testnet Hyperliquid")
     account_address: Optional[str] = Field(None, description="Adresse du wallet principal (trading délégué)")
 
-    @field_validator('symbol')
-    @classmethod
-    def validate_symbol(cls, v):
-        """Valide et normalise le symbole"""
-        return v.upper().strip()
-
     @field_validator('entry_price', 'stop_loss', 'take_profit_1', 'take_profit_2', 'take_profit_3')
     @classmethod
     def validate_prices(cls, v):
@@ -71,12 +68,22 @@ class TradeExecutionResult(BaseModel):
     take_profit_orders: list[str] = Field(default=[], description="IDs des ordres take-profit")
 
     # Métadonnées
-    execution_timestamp: datetime = Field(default_factory=datetime.now, description="Timestamp d'exécution")
+    execution_timestamp: Union[int, datetime] = Field(
+        default_factory=time.time_ns,
+        description="Timestamp d'exécution (ns epoch converti en datetime à la sérialisation)"
+    )
     total_fees: Optional[float] = Field(None, description="Frais totaux")
 
     # Erreurs partielles
     errors: list[str] = Field(default=[], description="Erreurs rencontrées")
 
+    @field_serializer('execution_timestamp')
+    def serialize_execution_timestamp(self, v: Union[int, datetime]) -> datetime:
+        """Convertit le timestamp en nanosecondes en datetime (ISO 8601 en JSON)"""
+        if isinstance(v, int):
+            return datetime.fromtimestamp(v / 1_000_000_000)
+        return v
+
 
 # =============================================================================
 # ORDRES HYPERLIQUID
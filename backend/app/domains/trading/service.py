@@ -1,8 +1,9 @@
 """Service de trading avec logique métier centralisée"""
 
 import asyncio
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import time
+from typing import Dict, List, Any, Optional, Tuple
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 import logging
 
@@ -19,6 +20,9 @@ from ...core.security import decrypt_api_key
 
 logger = logging.getLogger(__name__)
 
+# Validation/sérialisation de la liste de positions en une seule passe pydantic-core
+_POSITIONS_ADAPTER = TypeAdapter(List[PositionInfo])
+
 
 class TradingService:
     """
@@ -37,7 +41,7 @@ class TradingService:
     MIN_ORDER_VALUE_USD = 10.0  # Minimum Hyperliquid par ordre
     MAX_POSITION_PERCENTAGE = 50.0  # Maximum autorisé par trade
     SMALL_POSITION_THRESHOLD = 30.0  # Seuil pour TP unique vs multiple
-    TP_SPLIT_PERCENTAGES = [0.4, 0.35, 0.25]  # Répartition 40/35/25%
+    TP_SPLIT_PERCENTAGES = (0.4, 0.35, 0.25)  # Répartition 40/35/25%
     SAFETY_MARGIN = 0.95  # Garder 5% de marge sur balance disponible
 
     # Lot sizes par symbole (taille minimale d'ordre en nombre de décimales)
@@ -49,6 +53,11 @@ class TradingService:
         "MATIC": 1.0,    # 0 décimales
     }
 
+    # Templates de types d'ordre Hyperliquid (seul triggerPx varie par ordre)
+    _LIMIT_GTC_ORDER_TYPE = {"limit": {"tif": "Gtc"}}
+    _SL_TRIGGER_TEMPLATE = {"isMarket": True, "tpsl": "sl"}
+    _TP_TRIGGER_TEMPLATE = {"isMarket": True, "tpsl": "tp"}
+
     def __init__(self):
         self.hyperliquid_adapter = HyperliquidAdapter()
 
@@ -80,11 +89,12 @@ class TradingService:
 
         Returns:
             TradeExecutionResult avec statut et détails des ordres placés
+            (construit via model_construct : valeurs internes, pas de re-validation)
         """
         try:
             logger.info(
-                f"execute_trade: utilisateur {user.id}, "
-                f"{request.symbol} {request.direction.upper()} {request.portfolio_percentage}%"
+                "execute_trade: utilisateur %s, %s %s %s%%",
+                user.id, request.symbol, request.direction.upper(), request.portfolio_percentage
             )
 
             # 1. Récupérer et déchiffrer la clé privée
@@ -93,12 +103,12 @@ class TradingService:
             # 2. Injecter l'adresse publique pour trading délégué si configurée
             if user.hyperliquid_public_address and not request.account_address:
                 request.account_address = user.hyperliquid_public_address
-                logger.info(f"Mode délégué activé: {user.hyperliquid_public_address[:10]}...")
+                logger.info("Mode délégué activé: %.10s...", user.hyperliquid_public_address)
 
             # 3. Valider le trade (TOUTE la validation centralisée ici)
             validation_error = self.validate_trade_request(request)
             if validation_error:
-                return TradeExecutionResult(status="error", message=validation_error)
+                return TradeExecutionResult.model_construct(status="error", message=validation_error)
 
             # 4. Récupérer les informations du portefeuille
             portfolio_result = await self.hyperliquid_adapter.get_portfolio_summary(
@@ -108,13 +118,13 @@ class TradingService:
             )
 
             if portfolio_result["status"] != "success":
-                return TradeExecutionResult(
+                return TradeExecutionResult.model_construct(
                     status="error",
                     message=f"Erreur récupération portfolio: {portfolio_result.get('message')}"
                 )
 
             portfolio_data = portfolio_result["data"]
-            portfolio_info = PortfolioInfo(
+            portfolio_info = PortfolioInfo.model_construct(
                 account_value=portfolio_data["account_value"],
                 available_balance=portfolio_data["available_balance"],
                 symbol_position=self._get_current_position_size(
@@ -123,7 +133,7 @@ class TradingService:
                 max_leverage=1.0
             )
 
-            logger.info(f"Portefeuille: ${portfolio_info.account_value:.2f}")
+            logger.info("Portefeuille: $%.2f", portfolio_info.account_value)
 
             # 5. Calculer et valider la taille de position
             position_size = await self._calculate_position_size(
@@ -142,11 +152,11 @@ class TradingService:
                 portfolio_info.account_value
             )
             if validation_error:
-                return TradeExecutionResult(status="error", message=validation_error)
+                return TradeExecutionResult.model_construct(status="error", message=validation_error)
 
             logger.info(
-                f"Position: {position_size:.6f} {request.symbol} "
-                f"(${position_size * request.entry_price:.2f})"
+                "Position: %.6f %s ($%.2f)",
+                position_size, request.symbol, position_size * request.entry_price
             )
 
             # 6. Placer l'ordre principal d'entrée
@@ -161,12 +171,12 @@ class TradingService:
             )
 
             if not main_order_result["success"]:
-                return TradeExecutionResult(
+                return TradeExecutionResult.model_construct(
                     status="error",
                     message=f"Échec ordre principal: {main_order_result['error']}"
                 )
 
-            logger.info(f"Ordre principal placé - ID: {main_order_result['order_id']}")
+            logger.info("Ordre principal placé - ID: %s", main_order_result["order_id"])
 
             # 7. Placer les ordres de gestion des risques (SL + TPs)
             stop_loss_id, take_profit_ids, errors = await self._place_risk_management_orders(
@@ -180,9 +190,9 @@ class TradingService:
             message = f"Trade exécuté: {position_size:.4f} {request.symbol}"
             if errors:
                 message += f" ({len(errors)} erreurs)"
-                logger.warning(f"Erreurs: {errors}")
+                logger.warning("Erreurs: %s", errors)
 
-            return TradeExecutionResult(
+            return TradeExecutionResult.model_construct(
                 status=status,
                 message=message,
                 main_order_id=main_order_result["order_id"],
@@ -190,13 +200,13 @@ class TradingService:
                 executed_price=request.entry_price,
                 stop_loss_order_id=stop_loss_id,
                 take_profit_orders=take_profit_ids,
-                execution_timestamp=datetime.now(),
+                execution_timestamp=time.time_ns(),
                 errors=errors
             )
 
         except Exception as e:
             logger.error(f"Erreur exécution trade pour utilisateur {user.id}: {e}")
-            return TradeExecutionResult(
+            return TradeExecutionResult.model_construct(
                 status="error",
                 message=f"Erreur: {str(e)}"
             )
@@ -240,10 +250,7 @@ class TradingService:
             if not (request.take_profit_1 > request.take_profit_2 > request.take_profit_3):
                 return "Pour un short, les take-profits doivent être décroissants (TP1 > TP2 > TP3)"
 
-        # 3. Validation symbole
-        if not request.symbol or len(request.symbol) < 2:
-            return "Symbole invalide"
-
+        # Le symbole est déjà normalisé et validé (longueur ≥ 2) par ExecuteTradeRequest
         return None  # Tout est valide
 
     # =========================================================================
@@ -258,13 +265,15 @@ class TradingService:
     ) -> float:
         """Calcule la taille de position en fonction du pourcentage du portefeuille"""
 
+        safety_margin = self.SAFETY_MARGIN
+
         investment_amount = portfolio.account_value * (percentage / 100.0)
 
         # Utiliser available_balance si > 0, sinon account_value (cas perpétuels)
         max_investable = portfolio.available_balance if portfolio.available_balance > 0 else portfolio.account_value
 
         if investment_amount > max_investable:
-            investment_amount = max_investable * self.SAFETY_MARGIN
+            investment_amount = max_investable * safety_margin
 
         return investment_amount / entry_price
 
@@ -276,24 +285,29 @@ class TradingService:
     ) -> Optional[str]:
         """Valide que l'ordre respecte le minimum de $10 USD"""
 
+        # Constantes en variables locales (évite les lookups d'attributs répétés)
+        min_order_value = self.MIN_ORDER_VALUE_USD
+        max_percentage = self.MAX_POSITION_PERCENTAGE
+
         order_value_usd = position_size * entry_price
 
-        if order_value_usd >= self.MIN_ORDER_VALUE_USD:
+        if order_value_usd >= min_order_value:
             return None  # Valide
 
-        min_percentage_needed = (self.MIN_ORDER_VALUE_USD / account_value) * 100
-
         if account_value == 0:
             return "Portefeuille vide. Déposez des fonds ou utilisez le testnet."
-        elif min_percentage_needed > self.MAX_POSITION_PERCENTAGE:
+
+        min_percentage_needed = (min_order_value / account_value) * 100
+
+        if min_percentage_needed > max_percentage:
             return (
-                f"Fonds insuffisants. Minimum: ${self.MIN_ORDER_VALUE_USD:.2f} "
-                f"({min_percentage_needed:.1f}% du portefeuille) mais maximum: {self.MAX_POSITION_PERCENTAGE}%."
+                f"Fonds insuffisants. Minimum: ${min_order_value:.2f} "
+                f"({min_percentage_needed:.1f}% du portefeuille) mais maximum: {max_percentage}%."
             )
         else:
             return (
                 f"Ordre trop petit (${order_value_usd:.2f}). "
-                f"Minimum Hyperliquid: ${self.MIN_ORDER_VALUE_USD:.2f}. "
+                f"Minimum Hyperliquid: ${min_order_value:.2f}. "
                 f"Augmentez le pourcentage à minimum {min_percentage_needed:.1f}%."
             )
 
@@ -301,7 +315,7 @@ class TradingService:
         self,
         trade_request: ExecuteTradeRequest,
         position_size: float
-    ) -> tuple[List[float], List[Optional[float]]]:
+    ) -> tuple[Tuple[float, ...], Tuple[Optional[float], ...]]:
         """
         Calcule une stratégie de Take-Profits adaptative selon la taille de position
 
@@ -312,31 +326,37 @@ class TradingService:
             (tp_prices, tp_sizes) où tp_sizes[i] peut être None si trop petit
         """
         lot_size = self.LOT_SIZES.get(trade_request.symbol, 0.01)
-        position_value = position_size * trade_request.entry_price
+        min_order_value = self.MIN_ORDER_VALUE_USD
+        entry_price = trade_request.entry_price
+        position_value = position_size * entry_price
 
         # Stratégie pour petite position
         if position_value < self.SMALL_POSITION_THRESHOLD:
-            logger.info(f"Petite position (${position_value:.2f}) → TP unique sur meilleur prix")
-            return [trade_request.take_profit_3], [position_size]
+            logger.info("Petite position ($%.2f) → TP unique sur meilleur prix", position_value)
+            return (trade_request.take_profit_3,), (position_size,)
 
         # Stratégie standard : 3 TPs avec répartition 40/35/25%
-        tp_prices = [
+        tp_prices = (
             trade_request.take_profit_1,
             trade_request.take_profit_2,
             trade_request.take_profit_3
+        )
+
+        # Tailles arrondies au lot size en une seule passe
+        rounded_sizes = [
+            round(position_size * pct / lot_size) * lot_size
+            for pct in self.TP_SPLIT_PERCENTAGES
         ]
 
-        tp_sizes = []
-        for pct in self.TP_SPLIT_PERCENTAGES:
-            size = position_size * pct
-            size_rounded = round(size / lot_size) * lot_size
+        # Valider que chaque TP vaut au moins $10 (None = TP ignoré)
+        tp_sizes = tuple(
+            size if size * entry_price >= min_order_value else None
+            for size in rounded_sizes
+        )
 
-            # Valider que chaque TP vaut au moins $10
-            if size_rounded * trade_request.entry_price >= self.MIN_ORDER_VALUE_USD:
-                tp_sizes.append(size_rounded)
-            else:
-                logger.warning(f"TP ignoré (${size_rounded * trade_request.entry_price:.2f} < $10)")
-                tp_sizes.append(None)
+        for size, tp_size in zip(rounded_sizes, tp_sizes):
+            if tp_size is None:
+                logger.warning("TP ignoré ($%.2f < $10)", size * entry_price)
 
         return tp_prices, tp_sizes
 
@@ -356,16 +376,13 @@ class TradingService:
     ) -> Dict[str, Any]:
         """Place l'ordre d'entrée principal (limit order)"""
 
-        is_buy = direction == "long"
-        order_type = {"limit": {"tif": "Gtc"}}
-
         return await self.hyperliquid_adapter.place_order(
             private_key=private_key,
             symbol=symbol,
-            is_buy=is_buy,
+            is_buy=direction == "long",
             size=size,
             price=price,
-            order_type=order_type,
+            order_type=self._LIMIT_GTC_ORDER_TYPE,
             reduce_only=False,
             use_testnet=use_testnet,
             account_address=account_address
@@ -375,22 +392,15 @@ class TradingService:
         self,
         private_key: str,
         symbol: str,
-        direction: str,
+        is_buy: bool,
         size: float,
         stop_price: float,
         use_testnet: bool,
         account_address: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Place un ordre Stop-Loss (TPSL natif trigger-based)"""
-
-        is_buy = direction == "short"  # Ordre inverse
-        order_type = {
-            "trigger": {
-                "triggerPx": float(stop_price),
-                "isMarket": True,
-                "tpsl": "sl"
-            }
-        }
+        """Place un ordre Stop-Loss (TPSL natif trigger-based), is_buy = sens de clôture"""
+
+        order_type = {"trigger": {"triggerPx": float(stop_price), **self._SL_TRIGGER_TEMPLATE}}
 
         return await self.hyperliquid_adapter.place_order(
             private_key=private_key,
@@ -408,22 +418,15 @@ class TradingService:
         self,
         private_key: str,
         symbol: str,
-        direction: str,
+        is_buy: bool,
         size: float,
         tp_price: float,
         use_testnet: bool,
         account_address: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Place un ordre Take-Profit (TPSL natif trigger-based)"""
-
-        is_buy = direction == "short"  # Ordre inverse
-        order_type = {
-            "trigger": {
-                "triggerPx": float(tp_price),
-                "isMarket": True,
-                "tpsl": "tp"
-            }
-        }
+        """Place un ordre Take-Profit (TPSL natif trigger-based), is_buy = sens de clôture"""
+
+        order_type = {"trigger": {"triggerPx": float(tp_price), **self._TP_TRIGGER_TEMPLATE}}
 
         return await self.hyperliquid_adapter.place_order(
             private_key=private_key,
@@ -449,12 +452,15 @@ class TradingService:
         take_profit_ids = []
         errors = []
 
+        # Les ordres SL/TP sont inverses à la position (calculé une seule fois)
+        close_is_buy = trade_request.direction != "long"
+
         # 1. Stop-Loss
         try:
             sl_result = await self._place_stop_loss_order(
                 private_key,
                 trade_request.symbol,
-                trade_request.direction,
+                close_is_buy,
                 position_size,
                 trade_request.stop_loss,
                 trade_request.use_testnet,
@@ -462,7 +468,7 @@ class TradingService:
             )
             if sl_result["success"]:
                 stop_loss_id = sl_result["order_id"]
-                logger.info(f"Stop-Loss placé - ID: {stop_loss_id}")
+                logger.info("Stop-Loss placé - ID: %s", stop_loss_id)
             else:
                 errors.append(f"Stop-Loss: {sl_result['error']}")
         except Exception as e:
@@ -482,7 +488,7 @@ class TradingService:
                 tp_result = await self._place_take_profit_order(
                     private_key,
                     trade_request.symbol,
-                    trade_request.direction,
+                    close_is_buy,
                     tp_size,
                     tp_price,
                     trade_request.use_testnet,
@@ -491,7 +497,7 @@ class TradingService:
                 if tp_result["success"]:
                     tp_id = tp_result["order_id"] or f"TP{i+1}_pending"
                     take_profit_ids.append(tp_id)
-                    logger.info(f"TP{i+1} placé @ {tp_price} - ID: {tp_id}")
+                    logger.info("TP%d placé @ %s - ID: %s", i + 1, tp_price, tp_id)
                 else:
                     errors.append(f"TP{i+1}: {tp_result['error']}")
             except Exception as e:
@@ -557,11 +563,11 @@ class TradingService:
 
             # Convertir en schémas Pydantic si succès
             if result["status"] == "success":
-                positions = [PositionInfo(**pos) for pos in result["data"]["positions"]]
+                positions = _POSITIONS_ADAPTER.validate_python(result["data"]["positions"])
                 return {
                     "status": "success",
                     "data": {
-                        "positions": [pos.dict() for pos in positions],
+                        "positions": _POSITIONS_ADAPTER.dump_python(positions),
                         "count": len(positions)
                     }
                 }
@@ -694,7 +700,8 @@ class TradingService:
             raise ValueError("Aucune clé privée Hyperliquid configurée. Configurez-la dans vos paramètres.")
 
         try:
-            private_key = decrypt_api_key(user.hyperliquid_api_key)
+            # Déchiffrement Fernet hors de la boucle d'événements
+            private_key = await asyncio.to_thread(decrypt_api_key, user.hyperliquid_api_key)
 
             if not private_key:
                 raise ValueError("Clé privée Hyperliquid vide. Veuillez reconfigurer votre clé privée dans les paramètres.")
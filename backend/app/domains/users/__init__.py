@@ -2,6 +2,6 @@
 Domaine users - Gestion des profils utilisateurs et préférences
 """
 
-from .router import router
+from .router import router, stateless_router
 
-__all__ = ["router"]
+__all__ = ["router", "stateless_router"]
@@ -6,12 +6,18 @@ Responsabilité : Tester la validité des clés API sans les sauvegarder
 """
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from typing import Dict, Any
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Any, Optional, Tuple
+import asyncio
+import json
 import logging
+import re
+import time
 
-from ...core import decrypt_api_key
-from ...services.validators.api_validator import ApiValidator
+from ...core import decrypt_api_key_cached
+from ...services.validators.api_validator import ApiValidator, ValidationResult
 from ...domains.auth.models import User
 from ...domains.users.models import UserProfile
 
@@ -26,11 +32,222 @@ from .schemas import (
 logger = logging.getLogger(__name__)
 
 
+# Clé privée Hyperliquid : 0x + 64 caractères hexadécimaux
+_HYPERLIQUID_KEY_RE = re.compile(r'0x[0-9a-fA-F]{64}\Z')
+
+
+# ========== Cache des validations de clés stockées ==========
+
+# Durée de validité d'un test réussi (secondes)
+_VALIDATION_CACHE_TTL = 300
+
+# (user_id, api_type) -> (réponse, instant d'expiration monotonic)
+_validation_cache: Dict[Tuple[int, str], Tuple[ConnectorTestResponse, float]] = {}
+
+# Tests en cours : les appels concurrents pour la même clé attendent le même Future
+# (résolu à None si le meneur est annulé : un autre appelant reprend le test)
+_in_flight: Dict[Tuple[int, str], asyncio.Future] = {}
+
+
+def _get_cached_validation(key: Tuple[int, str]) -> Optional[ConnectorTestResponse]:
+    """Retourne la réponse en cache si elle n'a pas expiré"""
+    entry = _validation_cache.get(key)
+    if entry is None:
+        return None
+
+    response, expires_at = entry
+    if time.monotonic() >= expires_at:
+        _validation_cache.pop(key, None)
+        return None
+
+    return response
+
+
+def invalidate_validation_cache(user_id: int, api_type: Optional[str] = None) -> None:
+    """
+    Purge les validations en cache d'un utilisateur
+
+    À appeler quand une clé API est modifiée ou supprimée.
+
+    Args:
+        user_id: ID de l'utilisateur
+        api_type: Type d'API à purger (toutes si None)
+    """
+    if api_type is not None:
+        _validation_cache.pop((user_id, api_type), None)
+        return
+
+    for key in [key for key in _validation_cache if key[0] == user_id]:
+        _validation_cache.pop(key, None)
+
+
+# ========== Protection des appels sortants ==========
+
+# Appels simultanés maximum par fournisseur externe
+_PROVIDER_CONCURRENCY = 20
+
+# Délai maximum d'un appel de validation (au-delà des timeouts internes des providers)
+_PROVIDER_CALL_TIMEOUT = 15.0
+
+# Timeouts consécutifs avant ouverture du circuit, et durée d'ouverture (secondes)
+_BREAKER_FAILURE_THRESHOLD = 5
+_BREAKER_RESET_TIMEOUT = 30.0
+
+
+class _CircuitBreaker:
+    """
+    Disjoncteur minimal par fournisseur
+
+    Après N timeouts consécutifs, les appels échouent immédiatement pendant
+    reset_timeout secondes. Le circuit passe ensuite en semi-ouvert : un seul
+    appel d'essai est admis, les autres continuent d'échouer immédiatement
+    jusqu'à son issue. Un succès referme le circuit, un timeout le rouvre.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    def allow_request(self) -> bool:
+        """Indique si un appel peut partir (réserve l'essai en semi-ouvert)"""
+        if self._failures < self._failure_threshold:
+            return True
+        if self._probing or time.monotonic() < self._open_until:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self._failures >= self._failure_threshold:
+            self._open_until = time.monotonic() + self._reset_timeout
+
+    def release_probe(self) -> None:
+        """Libère l'essai en cours s'il a été interrompu sans issue (annulation)"""
+        self._probing = False
+
+
+# ========== Dispatch par type d'API ==========
+
+# api_type -> (colonne de la clé chiffrée dans UserProfile, méthode d'ApiValidator, erreur si absente)
+_STANDARD_API_DISPATCH: Dict[str, Tuple[str, str, str]] = {
+    "anthropic": (
+        "anthropic_api_key",
+        "validate_anthropic",
+        "Aucune clé Anthropic configurée. Veuillez d'abord enregistrer votre clé API."
+    ),
+    "coingecko": (
+        "coingecko_api_key",
+        "validate_coingecko",
+        "Aucune clé CoinGecko configurée. Veuillez d'abord enregistrer votre clé API."
+    ),
+}
+
+
+def _get_dispatch(api_type: str) -> Tuple[str, str, str]:
+    """Retourne l'entrée de dispatch d'un type d'API ou lève ValueError"""
+    entry = _STANDARD_API_DISPATCH.get(api_type)
+    if entry is None:
+        raise ValueError(f"Type d'API non supporté: {api_type}")
+    return entry
+
+
+# Services supportés : constante construite une seule fois (ne pas muter)
+_SUPPORTED_SERVICES: Dict[str, Any] = {
+    "status": "success",
+    "services": {
+        "standard_api": [
+            {
+                "type": "anthropic",
+                "name": "Anthropic Claude",
+                "auth_method": "api_key",
+                "key_prefix": "sk-ant-",
+                "description": "API Claude pour l'analyse IA"
+            },
+            {
+                "type": "coingecko",
+                "name": "CoinGecko",
+                "auth_method": "api_key",
+                "key_prefix": "CG-",
+                "description": "API CoinGecko pour les données de marché"
+            }
+        ],
+        "dex": [
+            {
+                "type": "hyperliquid",
+                "name": "Hyperliquid DEX",
+                "auth_method": "private_key",
+                "key_prefix": "0x",
+                "description": "DEX Hyperliquid pour le trading",
+                "testnet_available": True
+            }
+        ]
+    }
+}
+
+# Corps JSON pré-sérialisé de la réponse (même format que JSONResponse)
+SUPPORTED_SERVICES_JSON: bytes = json.dumps(
+    _SUPPORTED_SERVICES, ensure_ascii=False, separators=(",", ":")
+).encode("utf-8")
+
+
 class ApiKeyTestingService:
     """Service pour tester les clés API"""
 
-    def __init__(self):
-        self.api_validator = ApiValidator()
+    def __init__(self, use_shared_client: bool = False):
+        self.api_validator = ApiValidator(use_shared_client=use_shared_client)
+        self._semaphores = {
+            api_type: asyncio.Semaphore(_PROVIDER_CONCURRENCY)
+            for api_type in _STANDARD_API_DISPATCH
+        }
+        self._breakers = {
+            api_type: _CircuitBreaker(_BREAKER_FAILURE_THRESHOLD, _BREAKER_RESET_TIMEOUT)
+            for api_type in _STANDARD_API_DISPATCH
+        }
+
+    async def _call_provider(
+        self,
+        api_type: str,
+        validate: Callable[[str], Awaitable[ValidationResult]],
+        api_key: str
+    ) -> ValidationResult:
+        """
+        Appelle un validateur externe avec limite de concurrence et disjoncteur
+
+        Raises:
+            HTTPException: 503 si le circuit du fournisseur est ouvert
+        """
+        breaker = self._breakers[api_type]
+        if not breaker.allow_request():
+            raise HTTPException(
+                status_code=503,
+                detail=f"Service {api_type} temporairement indisponible. Réessayez dans quelques instants."
+            )
+
+        try:
+            async with self._semaphores[api_type]:
+                try:
+                    result = await asyncio.wait_for(validate(api_key), timeout=_PROVIDER_CALL_TIMEOUT)
+                except asyncio.TimeoutError:
+                    result = ValidationResult("error", "Timeout lors du test de connexion", timeout=True)
+        except BaseException:
+            breaker.release_probe()
+            raise
+
+        if result.timeout:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        return result
 
     async def test_standard_api(self, test_data: StandardApiKeyTest) -> ConnectorTestResponse:
         """
@@ -43,29 +260,32 @@ class ApiKeyTestingService:
             Résultat du test de connexion
         """
         try:
-            if test_data.api_type == "anthropic":
-                result = await self.api_validator.validate_anthropic(test_data.api_key)
-            elif test_data.api_type == "coingecko":
-                result = await self.api_validator.validate_coingecko(test_data.api_key)
-            else:
-                raise ValueError(f"Type d'API non supporté: {test_data.api_type}")
+            api_type = test_data.api_type.value
+            _, method_name, _ = _get_dispatch(api_type)
+            result = await self._call_provider(
+                api_type,
+                getattr(self.api_validator, method_name),
+                test_data.api_key
+            )
 
-            return ConnectorTestResponse(
-                status=result["status"],
-                message=result["message"],
-                data=result.get("data"),
-                validation=result.get("validation")
+            return ConnectorTestResponse.model_construct(
+                status=result.status,
+                message=result.message,
+                data=result.data,
+                validation=result.validation
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Erreur test {test_data.api_type}: {e}")
+            logger.error("Erreur test %s: %s", test_data.api_type.value, e)
             raise HTTPException(status_code=500, detail=f"Erreur interne: {str(e)}")
 
     async def test_stored_api_key(
         self,
         api_type: str,
         current_user: User,
-        db: Session
+        db: AsyncSession
     ) -> ConnectorTestResponse:
         """
         Teste une clé API stockée de l'utilisateur
@@ -73,54 +293,99 @@ class ApiKeyTestingService:
         Args:
             api_type: Type d'API à tester (anthropic, coingecko)
             current_user: Utilisateur authentifié
-            db: Session de base de données
+            db: Session de base de données asynchrone
 
         Returns:
             Résultat du test de connexion
+
+        Les tests réussis sont mis en cache 5 minutes par (utilisateur, API)
+        et les tests concurrents pour la même clé partagent un seul appel externe.
         """
+        cache_key = (current_user.id, api_type)
+
+        while True:
+            cached = _get_cached_validation(cache_key)
+            if cached is not None:
+                return cached
+
+            in_flight = _in_flight.get(cache_key)
+            if in_flight is None:
+                break
+
+            # shield : l'annulation d'un appelant n'annule pas le test partagé
+            response = await asyncio.shield(in_flight)
+            if response is not None:
+                return response
+            # Meneur annulé (déconnexion client) : reprendre comme nouveau meneur
+
+        future = asyncio.get_running_loop().create_future()
+        _in_flight[cache_key] = future
+
         try:
-            # Récupérer le profil utilisateur
-            profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
+            response = await self._run_stored_api_key_test(api_type, current_user, db)
+        except asyncio.CancelledError:
+            # Ne pas propager l'annulation aux appelants en attente
+            future.set_result(None)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marquer l'exception comme récupérée s'il n'y a aucun autre appelant
+            future.exception()
+            raise
+        else:
+            if response.status == "success":
+                _validation_cache[cache_key] = (
+                    response,
+                    time.monotonic() + _VALIDATION_CACHE_TTL
+                )
+            future.set_result(response)
+            return response
+        finally:
+            _in_flight.pop(cache_key, None)
 
-            if not profile:
+    async def _run_stored_api_key_test(
+        self,
+        api_type: str,
+        current_user: User,
+        db: AsyncSession
+    ) -> ConnectorTestResponse:
+        """Exécute le test d'une clé stockée (sans cache)"""
+        try:
+            attr, method_name, missing_key_error = _get_dispatch(api_type)
+
+            # Charger uniquement la colonne utile (pas d'instance ORM)
+            query_result = await db.execute(
+                select(getattr(UserProfile, attr)).where(UserProfile.user_id == current_user.id)
+            )
+            row = query_result.first()
+
+            if row is None:
                 raise HTTPException(
                     status_code=404,
                     detail="Profil utilisateur introuvable"
                 )
 
-            # Vérifier la clé selon le type
-            if api_type == "anthropic":
-                if not profile.anthropic_api_key:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Aucune clé Anthropic configurée. Veuillez d'abord enregistrer votre clé API."
-                    )
-                api_key = decrypt_api_key(profile.anthropic_api_key)
-                result = await self.api_validator.validate_anthropic(api_key)
-
-            elif api_type == "coingecko":
-                if not profile.coingecko_api_key:
-                    raise HTTPException(
-                        status_code=400,
-                        detail="Aucune clé CoinGecko configurée. Veuillez d'abord enregistrer votre clé API."
-                    )
-                api_key = decrypt_api_key(profile.coingecko_api_key)
-                result = await self.api_validator.validate_coingecko(api_key)
+            encrypted_key = row[0]
+            if not encrypted_key:
+                raise HTTPException(status_code=400, detail=missing_key_error)
 
-            else:
-                raise ValueError(f"Type d'API non supporté: {api_type}")
+            result = await self._call_provider(
+                api_type,
+                getattr(self.api_validator, method_name),
+                decrypt_api_key_cached(encrypted_key)
+            )
 
-            return ConnectorTestResponse(
-                status=result["status"],
-                message=result["message"],
-                data=result.get("data"),
-                validation=result.get("validation")
+            return ConnectorTestResponse.model_construct(
+                status=result.status,
+                message=result.message,
+                data=result.data,
+                validation=result.validation
             )
 
         except HTTPException:
             raise
         except Exception as e:
-            logger.error(f"Erreur test {api_type} stocké: {e}")
+            logger.error("Erreur test %s stocké: %s", api_type, e)
             raise HTTPException(status_code=500, detail=f"Erreur interne: {str(e)}")
 
     def validate_key_format(self, validation_request: KeyFormatValidation) -> ConnectorTestResponse:
@@ -142,28 +407,28 @@ class ApiKeyTestingService:
             elif validation_request.key_type == "private_key":
                 # Validation format clé privée Hyperliquid
                 if validation_request.service_type.lower() == "hyperliquid":
-                    if not validation_request.key.startswith('0x'):
+                    key = validation_request.key
+                    # Chemin rapide : préfixe, longueur et hex vérifiés en une passe
+                    if _HYPERLIQUID_KEY_RE.match(key):
+                        result = {
+                            "status": "success",
+                            "message": "Format de clé Hyperliquid valide"
+                        }
+                    elif not key.startswith('0x'):
                         result = {
                             "status": "error",
                             "message": "Clé Hyperliquid doit commencer par '0x'"
                         }
-                    elif len(validation_request.key) != 66:
+                    elif len(key) != 66:
                         result = {
                             "status": "error",
                             "message": "Clé Hyperliquid doit faire 66 caractères (0x + 64 caractères hex)"
                         }
                     else:
-                        try:
-                            int(validation_request.key[2:], 16)
-                            result = {
-                                "status": "success",
-                                "message": "Format de clé Hyperliquid valide"
-                            }
-                        except ValueError:
-                            result = {
-                                "status": "error",
-                                "message": "Clé Hyperliquid doit contenir uniquement des caractères hexadécimaux"
-                            }
+                        result = {
+                            "status": "error",
+                            "message": "Clé Hyperliquid doit contenir uniquement des caractères hexadécimaux"
+                        }
                 else:
                     result = {
                         "status": "error",
@@ -175,13 +440,13 @@ class ApiKeyTestingService:
                     "message": f"Type de clé non supporté: {validation_request.key_type}"
                 }
 
-            return ConnectorTestResponse(
+            return ConnectorTestResponse.model_construct(
                 status=result["status"],
                 message=result["message"]
             )
 
         except Exception as e:
-            logger.error(f"Erreur validation format clé: {e}")
+            logger.error("Erreur validation format clé: %s", e)
             raise HTTPException(status_code=500, detail=f"Erreur interne: {str(e)}")
 
     def get_supported_services(self) -> Dict[str, Any]:
@@ -191,34 +456,12 @@ class ApiKeyTestingService:
         Returns:
             Dictionnaire des services supportés
         """
-        return {
-            "status": "success",
-            "services": {
-                "standard_api": [
-                    {
-                        "type": "anthropic",
-                        "name": "Anthropic Claude",
-                        "auth_method": "api_key",
-                        "key_prefix": "sk-ant-",
-                        "description": "API Claude pour l'analyse IA"
-                    },
-                    {
-                        "type": "coingecko",
-                        "name": "CoinGecko",
-                        "auth_method": "api_key",
-                        "key_prefix": "CG-",
-                        "description": "API CoinGecko pour les données de marché"
-                    }
-                ],
-                "dex": [
-                    {
-                        "type": "hyperliquid",
-                        "name": "Hyperliquid DEX",
-                        "auth_method": "private_key",
-                        "key_prefix": "0x",
-                        "description": "DEX Hyperliquid pour le trading",
-                        "testnet_available": True
-                    }
-                ]
-            }
-        }
+        return _SUPPORTED_SERVICES
+
+
+@lru_cache(maxsize=1)
+def get_api_key_testing_service() -> ApiKeyTestingService:
+    """Dépendance FastAPI : instance unique du service de test de clés API"""
+    # Le client HTTP partagé est résolu à chaque test (il est recréé après un
+    # redémarrage du lifespan), jamais capturé dans l'instance mise en cache
+    return ApiKeyTestingService(use_shared_client=True)
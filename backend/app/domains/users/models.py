@@ -4,8 +4,9 @@ Modèles pour le domaine users - Profils utilisateurs et préférences
 
 from sqlalchemy import (
     Column, Integer, String, Float, Text, DateTime, ForeignKey,
-    CheckConstraint, Enum as SQLEnum
+    CheckConstraint, Index, Enum as SQLEnum, text
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum
@@ -37,6 +38,8 @@ class TradingStyle(str, Enum):
 
 # ========== Modèles ==========
 
+# Les enums sont stockés en VARCHAR(16) + CHECK (pas de type ENUM natif PostgreSQL)
+
 class UserProfile(Base):
     """
     Profil utilisateur avec clés API chiffrées
@@ -63,6 +66,25 @@ class UserProfile(Base):
     # Relations
     user = relationship("User", back_populates="profile")
 
+    # Index partiels : sondes "l'utilisateur a-t-il une clé X ?" sans lire la ligne
+    __table_args__ = (
+        Index(
+            'ix_profile_has_hyperliquid', 'user_id',
+            postgresql_where=text('hyperliquid_api_key IS NOT NULL')
+        ),
+        Index(
+            'ix_profile_has_anthropic', 'user_id',
+            postgresql_where=text('anthropic_api_key IS NOT NULL')
+        ),
+        Index(
+            'ix_profile_has_coingecko', 'user_id',
+            postgresql_where=text('coingecko_api_key IS NOT NULL')
+        ),
+    )
+
+    # created_at / updated_at récupérés par RETURNING lors du flush (pas de refresh)
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<UserProfile(user_id={self.user_id})>"
 
@@ -80,21 +102,24 @@ class UserTradingPreferences(Base):
 
     # Préférences de risque et style
     risk_tolerance = Column(
-        SQLEnum(RiskTolerance),
+        SQLEnum(RiskTolerance, native_enum=False, length=16, validate_strings=True,
+                create_constraint=True, name="risktolerance"),
         nullable=False,
         default=RiskTolerance.MEDIUM,
         comment="Tolérance au risque de l'utilisateur"
     )
 
     investment_horizon = Column(
-        SQLEnum(InvestmentHorizon),
+        SQLEnum(InvestmentHorizon, native_enum=False, length=16, validate_strings=True,
+                create_constraint=True, name="investmenthorizon"),
         nullable=False,
         default=InvestmentHorizon.MEDIUM_TERM,
         comment="Horizon d'investissement préféré"
     )
 
     trading_style = Column(
-        SQLEnum(TradingStyle),
+        SQLEnum(TradingStyle, native_enum=False, length=16, validate_strings=True,
+                create_constraint=True, name="tradingstyle"),
         nullable=False,
         default=TradingStyle.BALANCED,
         comment="Style de trading de l'utilisateur"
@@ -122,18 +147,18 @@ class UserTradingPreferences(Base):
         comment="Ratio risk/reward pour take-profit"
     )
 
-    # Préférences d'actifs et indicateurs (JSON)
+    # Préférences d'actifs et indicateurs (JSONB : listes décodées par le driver)
     preferred_assets = Column(
-        Text,
+        JSONB,
         nullable=True,
-        default='["BTC", "ETH"]',
+        default=lambda: ["BTC", "ETH"],
         comment="Liste JSON des actifs préférés"
     )
 
     technical_indicators = Column(
-        Text,
+        JSONB,
         nullable=True,
-        default='["RSI", "MACD", "SMA"]',
+        default=lambda: ["RSI", "MACD", "SMA"],
         comment="Liste JSON des indicateurs techniques préférés"
     )
 
@@ -160,5 +185,8 @@ class UserTradingPreferences(Base):
         ),
     )
 
+    # created_at / updated_at récupérés par RETURNING lors du flush (pas de refresh)
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self):
         return f"<UserTradingPreferences(user_id={self.user_id}, risk_tolerance={self.risk_tolerance})>"
@@ -4,8 +4,9 @@ Router pour le domaine users - Endpoints des profils et préférences
 ✅ OPTIMISATION : Router mince qui délègue toute la logique aux services
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .schemas import (
     UserProfileUpdate, ApiKeyUpdate, UserProfileResponse,
@@ -15,125 +16,158 @@ from .schemas import (
     KeyFormatValidation, UserInfoRequest
 )
 from .service import UserService, PreferencesService
-from .api_key_testing import ApiKeyTestingService
+from .api_key_testing import (
+    ApiKeyTestingService, get_api_key_testing_service, SUPPORTED_SERVICES_JSON
+)
+from .models import UserProfile
 from ..auth.models import User
-from ...core import get_db, get_current_user
+from ...core import get_async_db, get_async_current_user, get_current_user_id
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# Endpoints sans état : pas de session DB ni de chargement de l'utilisateur
+stateless_router = APIRouter(prefix="/users", tags=["users"])
+
+
+def _model_response(model: BaseModel) -> Response:
+    """
+    Sérialise directement un schéma déjà construit par le service
+
+    Retourner une Response court-circuite la re-validation du response_model
+    par FastAPI (qui reste utilisé pour la documentation OpenAPI).
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+async def get_user_profile(
+    request: Request,
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserProfile:
+    """
+    Dépendance : profil de l'utilisateur, chargé au plus une fois par requête
+
+    Le profil est conservé sur request.state et réutilisé par les dépendances suivantes.
+    """
+    profile = getattr(request.state, "user_profile", None)
+    if profile is None:
+        profile = await UserService.get_or_create_profile(db, current_user)
+        request.state.user_profile = profile
+    return profile
+
 
 # ========== Endpoints Profil Utilisateur ==========
 
 @router.get("/me", response_model=UserProfileResponse)
 async def get_profile(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Récupère le profil complet de l'utilisateur actuel
 
     ✅ SÉCURITÉ : Les clés API sont automatiquement masquées
+    Servi depuis le cache du service quand c'est possible (pas de SELECT du profil)
     """
-    return UserService.get_profile_response(db, current_user)
+    return _model_response(await UserService.get_profile_response(db, current_user))
 
 
 @router.put("/me", response_model=UserProfileResponse)
 async def update_profile(
     profile_update: UserProfileUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    profile: UserProfile = Depends(get_user_profile),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Met à jour le profil utilisateur (email, username)
     """
-    return UserService.update_profile(db, current_user, profile_update)
+    return _model_response(await UserService.update_profile(db, current_user, profile_update, profile))
 
 
 @router.put("/me/api-keys", response_model=UserProfileResponse)
 async def update_api_keys(
     api_keys: ApiKeyUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    profile: UserProfile = Depends(get_user_profile),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Met à jour les clés API de l'utilisateur
 
     ✅ OPTIMISATION : Utilise la méthode unifiée du service
     """
-    return UserService.update_api_keys(db, current_user, api_keys)
+    return _model_response(await UserService.update_api_keys(db, current_user, api_keys, profile))
 
 
 # ========== Endpoints Préférences de Trading ==========
 
 @router.get("/me/preferences", response_model=UserTradingPreferencesResponse)
 async def get_preferences(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Récupère les préférences de trading de l'utilisateur actuel.
     Si l'utilisateur n'a pas de préférences, retourne les valeurs par défaut.
     """
-    return PreferencesService.get_preferences(db, current_user)
+    return _model_response(await PreferencesService.get_preferences(db, current_user))
 
 
 @router.post("/me/preferences", response_model=UserTradingPreferencesResponse)
 async def create_preferences(
     preferences_data: UserTradingPreferencesCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Crée de nouvelles préférences de trading pour l'utilisateur actuel.
     Retourne une erreur si des préférences existent déjà (utiliser PUT pour mettre à jour).
     """
-    return PreferencesService.create_preferences(db, current_user, preferences_data)
+    return _model_response(await PreferencesService.create_preferences(db, current_user, preferences_data))
 
 
 @router.put("/me/preferences", response_model=UserTradingPreferencesResponse)
 async def update_preferences(
     preferences_update: UserTradingPreferencesUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Met à jour les préférences de trading de l'utilisateur actuel.
     Crée des préférences par défaut si elles n'existent pas.
     """
-    return PreferencesService.update_preferences(db, current_user, preferences_update)
+    return _model_response(await PreferencesService.update_preferences(db, current_user, preferences_update))
 
 
 @router.delete("/me/preferences")
 async def delete_preferences(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Supprime les préférences de trading de l'utilisateur actuel.
     Retourne les préférences aux valeurs par défaut lors du prochain accès.
     """
-    return PreferencesService.delete_preferences(db, current_user)
+    return await PreferencesService.delete_preferences(db, current_user)
 
 
-@router.get("/me/preferences/default", response_model=UserTradingPreferencesDefault)
+@stateless_router.get("/me/preferences/default", response_model=UserTradingPreferencesDefault)
 async def get_default_preferences():
     """
     Retourne les valeurs par défaut des préférences de trading.
     Utile pour afficher les valeurs par défaut dans l'interface utilisateur.
     """
-    return PreferencesService.get_default_preferences()
+    return _model_response(PreferencesService.get_default_preferences())
 
 
 # ========== Endpoints Tests de Clés API (migré depuis routes/connectors.py) ==========
 
-# Initialisation du service de test
-api_testing_service = ApiKeyTestingService()
-
-
 @router.post("/me/api-keys/test", response_model=ConnectorTestResponse)
 async def test_api_key(
     test_data: StandardApiKeyTest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_async_current_user),
+    api_testing_service: ApiKeyTestingService = Depends(get_api_key_testing_service)
 ):
     """
     Teste une nouvelle clé API (Anthropic, CoinGecko) sans la sauvegarder
@@ -146,8 +180,9 @@ async def test_api_key(
 @router.post("/me/api-keys/test-stored/{api_type}", response_model=ConnectorTestResponse)
 async def test_stored_api_key(
     api_type: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_async_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    api_testing_service: ApiKeyTestingService = Depends(get_api_key_testing_service)
 ):
     """
     Teste une clé API stockée de l'utilisateur
@@ -163,7 +198,8 @@ async def test_stored_api_key(
 @router.post("/me/api-keys/validate-format", response_model=ConnectorTestResponse)
 async def validate_api_key_format(
     validation_request: KeyFormatValidation,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_async_current_user),
+    api_testing_service: ApiKeyTestingService = Depends(get_api_key_testing_service)
 ):
     """
     Valide le format d'une clé API sans tester la connexion
@@ -173,13 +209,15 @@ async def validate_api_key_format(
     return api_testing_service.validate_key_format(validation_request)
 
 
-@router.get("/me/api-keys/supported-services")
+@stateless_router.get("/me/api-keys/supported-services")
 async def get_supported_api_services(
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
     """
     Retourne la liste des services d'API supportés
 
+    Le corps JSON est constant et pré-sérialisé au chargement du module
+
     Migré depuis GET /connectors/supported-services
     """
-    return api_testing_service.get_supported_services()
+    return Response(content=SUPPORTED_SERVICES_JSON, media_type="application/json")
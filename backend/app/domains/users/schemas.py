@@ -2,21 +2,54 @@
 Schémas Pydantic pour le domaine users - Profils et préférences
 """
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional, List, Literal, Union
-from datetime import datetime
-import json
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints, create_model, field_validator
+from typing import Annotated, Optional, List, Literal, Tuple, Union
+from datetime import datetime, timezone
+from enum import Enum
+from functools import lru_cache
 
 from .models import RiskTolerance, InvestmentHorizon, TradingStyle
 
 
+# Indicateurs techniques supportés (test d'appartenance en O(1))
+SUPPORTED_INDICATORS: frozenset = frozenset({
+    "RSI", "MACD", "SMA", "EMA", "BB", "STOCH", "ADX", "CCI", "ROC",
+    "WILLIAMS", "ATR", "VWAP", "OBV", "TRIX", "CHAIKIN"
+})
+
+# Valeurs par défaut immuables (copiées en liste seulement quand nécessaire)
+DEFAULT_ASSETS = ("BTC", "ETH")
+DEFAULT_INDICATORS = ("RSI", "MACD", "SMA")
+
+# Symbole d'actif : alphanumérique ASCII, 1 à 10 caractères, normalisé en majuscules
+# (nettoyage, format et casse validés par pydantic-core, sans callback Python)
+AssetSymbol = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, to_upper=True, pattern=r'^[A-Za-z0-9]{1,10}$')
+]
+
+# Nom d'indicateur technique normalisé en majuscules
+IndicatorName = Annotated[str, StringConstraints(strip_whitespace=True, to_upper=True)]
+
+
 # ========== Helpers ==========
 
+def _now() -> datetime:
+    """Horodatage UTC avec fuseau (remplace datetime.utcnow, déprécié)"""
+    return datetime.now(timezone.utc)
+
+
+# Longueur du préfixe conservé lors du masquage, indexé par préfixe
+_PREFIX_LEN = {"sk-": 3, "CG-": 3, "0x": 2}
+
+
+@lru_cache(maxsize=1024)
 def mask_api_key(api_key: Optional[str], show_last_chars: int = 4) -> Optional[str]:
     """
     Masque une clé API pour affichage sécurisé
 
-    ✅ OPTIMISATION : Fonction centrale pour masquage cohérent
+    ✅ OPTIMISATION : Fonction centrale pour masquage cohérent, mémoïsée
+    (la même clé stockée est masquée à chaque requête du même utilisateur)
 
     Args:
         api_key: Clé API à masquer
@@ -29,31 +62,102 @@ def mask_api_key(api_key: Optional[str], show_last_chars: int = 4) -> Optional[s
         return None
 
     # Extraire le préfixe (ex: "sk-", "CG-", "0x")
-    prefix_length = 3 if api_key.startswith(("sk-", "CG-")) else 2 if api_key.startswith("0x") else 0
+    prefix_length = _PREFIX_LEN.get(api_key[:3]) or _PREFIX_LEN.get(api_key[:2], 0)
+    prefix = api_key[:prefix_length] if prefix_length else "***"
+
+    return f"{prefix}...{api_key[-show_last_chars:]}"
+
+
+def _normalize_assets(v: List[str]) -> List[str]:
+    """
+    Déduplique la liste des actifs préférés (partagé par création et mise à jour)
+
+    Chaque symbole a déjà été nettoyé et validé par AssetSymbol.
+    """
+    if not v:
+        return list(DEFAULT_ASSETS)
+
+    # Supprimer les doublons (l'ordre est conservé)
+    normalized = list(dict.fromkeys(v))
+
+    if len(normalized) > 20:
+        raise ValueError("Maximum 20 actifs préférés autorisés")
+
+    return normalized
+
 
-    if prefix_length > 0:
-        prefix = api_key[:prefix_length]
-        suffix = api_key[-show_last_chars:]
-        return f"{prefix}...{suffix}"
-    else:
-        suffix = api_key[-show_last_chars:]
-        return f"***...{suffix}"
+def _normalize_indicators(v: List[str]) -> List[str]:
+    """
+    Filtre et déduplique la liste des indicateurs techniques (partagé par création et mise à jour)
+
+    Chaque nom a déjà été nettoyé et mis en majuscules par IndicatorName.
+    """
+    if not v:
+        return list(DEFAULT_INDICATORS)
+
+    # Ne garder que les indicateurs supportés, sans doublons (l'ordre est conservé)
+    normalized = list(dict.fromkeys(
+        indicator for indicator in v if indicator in SUPPORTED_INDICATORS
+    ))
+
+    if len(normalized) > 15:
+        raise ValueError("Maximum 15 indicateurs techniques autorisés")
+
+    return normalized
 
 
 # ========== Schémas UserProfile ==========
 
+# Champs de clés API masqués dans les réponses et leur champ de statut
+_KEY_FIELDS = (
+    ("hyperliquid_api_key", "hyperliquid_api_key_status"),
+    ("anthropic_api_key", "anthropic_api_key_status"),
+    ("coingecko_api_key", "coingecko_api_key_status"),
+)
+
+
+# Colonnes lues sur User et UserProfile pour construire UserProfileResponse
+_USER_FIELDS = ("id", "email", "username", "created_at", "updated_at")
+_PROFILE_FIELDS = tuple(key_field for key_field, _ in _KEY_FIELDS) + ("hyperliquid_public_address",)
+
+
+def _loaded_values(instance, names):
+    """
+    Lit des colonnes ORM déjà chargées directement dans __dict__
+
+    Évite le descripteur InstrumentedAttribute par champ ; getattr reste utilisé
+    pour les attributs expirés ou non chargés (rechargement par SQLAlchemy).
+    """
+    state = instance.__dict__
+    return {
+        name: state[name] if name in state else getattr(instance, name)
+        for name in names
+    }
+
+
 class UserProfileUpdate(BaseModel):
     """Schéma pour mettre à jour le profil utilisateur"""
     email: Optional[EmailStr] = None
     username: Optional[str] = None
 
 
-class ApiKeyUpdate(BaseModel):
-    """Schéma pour mettre à jour les clés API"""
-    hyperliquid_api_key: Optional[str] = None
-    hyperliquid_public_address: Optional[str] = None
-    anthropic_api_key: Optional[str] = None
-    coingecko_api_key: Optional[str] = None
+# Clés API chiffrées avant stockage
+ENCRYPTED_KEY_FIELDS = frozenset(key_field for key_field, _ in _KEY_FIELDS)
+
+# Champs modifiables via PUT /users/me/api-keys : (type, défaut)
+_API_KEY_UPDATE_FIELDS = {
+    "hyperliquid_api_key": (Optional[str], None),
+    "hyperliquid_public_address": (Optional[str], None),
+    "anthropic_api_key": (Optional[str], None),
+    "coingecko_api_key": (Optional[str], None),
+}
+
+# Schéma pour mettre à jour les clés API (généré depuis le registre de champs)
+ApiKeyUpdate = create_model(
+    "ApiKeyUpdate",
+    __doc__="Schéma pour mettre à jour les clés API",
+    **_API_KEY_UPDATE_FIELDS
+)
 
 
 class UserProfileResponse(BaseModel):
@@ -81,8 +185,7 @@ class UserProfileResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
 
     @classmethod
     def from_user_and_profile(cls, user, profile=None):
@@ -96,42 +199,25 @@ class UserProfileResponse(BaseModel):
         Returns:
             UserProfileResponse avec clés masquées
         """
-        # Clés masquées
-        hyperliquid_key_masked = None
-        anthropic_key_masked = None
-        coingecko_key_masked = None
-
-        # Statuts
-        hyperliquid_status = None
-        anthropic_status = None
-        coingecko_status = None
-
-        if profile:
-            if profile.hyperliquid_api_key:
-                hyperliquid_key_masked = mask_api_key(profile.hyperliquid_api_key)
-                hyperliquid_status = "configured"
-
-            if profile.anthropic_api_key:
-                anthropic_key_masked = mask_api_key(profile.anthropic_api_key)
-                anthropic_status = "configured"
-
-            if profile.coingecko_api_key:
-                coingecko_key_masked = mask_api_key(profile.coingecko_api_key)
-                coingecko_status = "configured"
-
-        return cls(
-            id=user.id,
-            email=user.email,
-            username=user.username,
-            hyperliquid_api_key=hyperliquid_key_masked,
-            hyperliquid_public_address=profile.hyperliquid_public_address if profile else None,
-            anthropic_api_key=anthropic_key_masked,
-            coingecko_api_key=coingecko_key_masked,
-            hyperliquid_api_key_status=hyperliquid_status,
-            anthropic_api_key_status=anthropic_status,
-            coingecko_api_key_status=coingecko_status,
-            created_at=user.created_at,
-            updated_at=user.updated_at
+        user_values = _loaded_values(user, _USER_FIELDS)
+        profile_values = _loaded_values(profile, _PROFILE_FIELDS) if profile else {}
+
+        fields = {}
+        for key_field, status_field in _KEY_FIELDS:
+            value = profile_values.get(key_field)
+            if value:
+                # Clé masquée et statut de configuration
+                fields[key_field] = mask_api_key(value)
+                fields[status_field] = "configured"
+            else:
+                fields[key_field] = None
+                fields[status_field] = None
+
+        # Données issues de l'ORM, déjà typées : pas de re-validation
+        return cls.model_construct(
+            **user_values,
+            hyperliquid_public_address=profile_values.get("hyperliquid_public_address"),
+            **fields
         )
 
 
@@ -175,14 +261,14 @@ class UserTradingPreferencesBase(BaseModel):
         description="Ratio risk/reward pour take-profit (0.1-10)"
     )
 
-    preferred_assets: List[str] = Field(
-        default=["BTC", "ETH"],
+    preferred_assets: List[AssetSymbol] = Field(
+        default_factory=lambda: list(DEFAULT_ASSETS),
         max_length=20,
         description="Liste des actifs préférés (max 20)"
     )
 
-    technical_indicators: List[str] = Field(
-        default=["RSI", "MACD", "SMA"],
+    technical_indicators: List[IndicatorName] = Field(
+        default_factory=lambda: list(DEFAULT_INDICATORS),
         max_length=15,
         description="Liste des indicateurs techniques préférés (max 15)"
     )
@@ -191,49 +277,13 @@ class UserTradingPreferencesBase(BaseModel):
     @classmethod
     def validate_preferred_assets(cls, v):
         """Valide la liste des actifs préférés"""
-        if not v:
-            return ["BTC", "ETH"]
-
-        # Normaliser en majuscules et supprimer les doublons
-        normalized = list(set([asset.upper().strip() for asset in v if asset.strip()]))
-
-        if len(normalized) > 20:
-            raise ValueError("Maximum 20 actifs préférés autorisés")
-
-        # Validation basique du format des symboles
-        for asset in normalized:
-            if not asset.isalnum() or len(asset) > 10:
-                raise ValueError(f"Format d'actif invalide: {asset}")
-
-        return normalized
+        return _normalize_assets(v)
 
     @field_validator('technical_indicators')
     @classmethod
     def validate_technical_indicators(cls, v):
         """Valide la liste des indicateurs techniques"""
-        if not v:
-            return ["RSI", "MACD", "SMA"]
-
-        # Liste des indicateurs supportés
-        supported_indicators = [
-            "RSI", "MACD", "SMA", "EMA", "BB", "STOCH", "ADX", "CCI", "ROC",
-            "WILLIAMS", "ATR", "VWAP", "OBV", "TRIX", "CHAIKIN"
-        ]
-
-        # Normaliser et valider
-        normalized = []
-        for indicator in v:
-            indicator = indicator.upper().strip()
-            if indicator in supported_indicators:
-                normalized.append(indicator)
-
-        # Supprimer les doublons
-        normalized = list(set(normalized))
-
-        if len(normalized) > 15:
-            raise ValueError("Maximum 15 indicateurs techniques autorisés")
-
-        return normalized
+        return _normalize_indicators(v)
 
 
 class UserTradingPreferencesCreate(UserTradingPreferencesBase):
@@ -249,24 +299,20 @@ class UserTradingPreferencesUpdate(BaseModel):
     max_position_size: Optional[float] = Field(None, ge=0.1, le=100.0)
     stop_loss_percentage: Optional[float] = Field(None, ge=0.1, le=50.0)
     take_profit_ratio: Optional[float] = Field(None, ge=0.1, le=10.0)
-    preferred_assets: Optional[List[str]] = Field(None, max_length=20)
-    technical_indicators: Optional[List[str]] = Field(None, max_length=15)
+    preferred_assets: Optional[List[AssetSymbol]] = Field(None, max_length=20)
+    technical_indicators: Optional[List[IndicatorName]] = Field(None, max_length=15)
 
     @field_validator('preferred_assets')
     @classmethod
     def validate_preferred_assets_update(cls, v):
         """Valide la liste des actifs préférés lors d'une mise à jour"""
-        if v is None:
-            return v
-        return UserTradingPreferencesBase.validate_preferred_assets(v)
+        return v if v is None else _normalize_assets(v)
 
     @field_validator('technical_indicators')
     @classmethod
     def validate_technical_indicators_update(cls, v):
         """Valide la liste des indicateurs techniques lors d'une mise à jour"""
-        if v is None:
-            return v
-        return UserTradingPreferencesBase.validate_technical_indicators(v)
+        return v if v is None else _normalize_indicators(v)
 
 
 class UserTradingPreferencesResponse(UserTradingPreferencesBase):
@@ -276,44 +322,19 @@ class UserTradingPreferencesResponse(UserTradingPreferencesBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='forbid')
 
     @classmethod
     def from_db_model(cls, db_preferences):
         """Convertit le modèle DB en schéma de réponse"""
         if not db_preferences:
-            # Retourner les valeurs par défaut si pas de préférences
-            return cls(
-                id=0,
-                user_id=0,
-                risk_tolerance=RiskTolerance.MEDIUM,
-                investment_horizon=InvestmentHorizon.MEDIUM_TERM,
-                trading_style=TradingStyle.BALANCED,
-                max_position_size=10.0,
-                stop_loss_percentage=5.0,
-                take_profit_ratio=2.0,
-                preferred_assets=["BTC", "ETH"],
-                technical_indicators=["RSI", "MACD", "SMA"],
-                created_at=datetime.utcnow(),
-                updated_at=None
-            )
-
-        # Convertir les JSON strings en listes
-        preferred_assets = ["BTC", "ETH"]
-        technical_indicators = ["RSI", "MACD", "SMA"]
-
-        try:
-            if db_preferences.preferred_assets:
-                preferred_assets = json.loads(db_preferences.preferred_assets)
-        except (json.JSONDecodeError, TypeError):
-            pass
-
-        try:
-            if db_preferences.technical_indicators:
-                technical_indicators = json.loads(db_preferences.technical_indicators)
-        except (json.JSONDecodeError, TypeError):
-            pass
+            # Retourner les valeurs par défaut si pas de préférences (instance pré-construite,
+            # horodatée à la requête comme avant)
+            return _DEFAULT_PREFS_RESPONSE.model_copy(update={"created_at": _now()})
+
+        # Colonnes JSONB : listes déjà décodées par le driver
+        preferred_assets = db_preferences.preferred_assets or list(DEFAULT_ASSETS)
+        technical_indicators = db_preferences.technical_indicators or list(DEFAULT_INDICATORS)
 
         return cls(
             id=db_preferences.id,
@@ -331,16 +352,35 @@ class UserTradingPreferencesResponse(UserTradingPreferencesBase):
         )
 
 
+# Réponse par défaut construite une seule fois, sans validation
+# (created_at est fixé à chaque copie dans from_db_model)
+_DEFAULT_PREFS_RESPONSE = UserTradingPreferencesResponse.model_construct(
+    id=0,
+    user_id=0,
+    risk_tolerance=RiskTolerance.MEDIUM,
+    investment_horizon=InvestmentHorizon.MEDIUM_TERM,
+    trading_style=TradingStyle.BALANCED,
+    max_position_size=10.0,
+    stop_loss_percentage=5.0,
+    take_profit_ratio=2.0,
+    preferred_assets=list(DEFAULT_ASSETS),
+    technical_indicators=list(DEFAULT_INDICATORS),
+    updated_at=None
+)
+
+
 class UserTradingPreferencesDefault(BaseModel):
     """Schéma pour les valeurs par défaut des préférences"""
+    model_config = ConfigDict(frozen=True)
+
     risk_tolerance: RiskTolerance = RiskTolerance.MEDIUM
     investment_horizon: InvestmentHorizon = InvestmentHorizon.MEDIUM_TERM
     trading_style: TradingStyle = TradingStyle.BALANCED
     max_position_size: float = 10.0
     stop_loss_percentage: float = 5.0
     take_profit_ratio: float = 2.0
-    preferred_assets: List[str] = ["BTC", "ETH"]
-    technical_indicators: List[str] = ["RSI", "MACD", "SMA"]
+    preferred_assets: Tuple[str, ...] = DEFAULT_ASSETS
+    technical_indicators: Tuple[str, ...] = DEFAULT_INDICATORS
 
 
 class PreferencesValidationError(BaseModel):
@@ -355,23 +395,54 @@ class PreferencesValidationError(BaseModel):
 # Migré depuis app/schemas/connectors.py
 # ═══════════════════════════════════════════════════════════════
 
+class ApiType(str, Enum):
+    """APIs standard testables par clé API"""
+    ANTHROPIC = "anthropic"
+    OPENAI = "openai"
+    COINGECKO = "coingecko"
+
+
+class DexType(str, Enum):
+    """DEX supportés"""
+    HYPERLIQUID = "hyperliquid"
+
+
+class Network(str, Enum):
+    """Réseau d'un DEX"""
+    MAINNET = "mainnet"
+    TESTNET = "testnet"
+
+
+class ServiceType(str, Enum):
+    """Services dont on peut récupérer les informations utilisateur"""
+    HYPERLIQUID = "hyperliquid"
+    ANTHROPIC = "anthropic"
+    COINGECKO = "coingecko"
+
+
 class StandardApiKeyTest(BaseModel):
     """Schéma pour tester une clé API standard (Anthropic, OpenAI, CoinGecko, etc.)"""
+    model_config = ConfigDict(frozen=True)
+
     api_key: str = Field(..., description="Clé API à tester")
-    api_type: Literal["anthropic", "openai", "coingecko"] = Field(default="anthropic", description="Type d'API")
+    api_type: ApiType = Field(default=ApiType.ANTHROPIC, description="Type d'API")
 
 
 class DexKeyTest(BaseModel):
     """Schéma pour tester une clé DEX (Hyperliquid, etc.)"""
+    model_config = ConfigDict(frozen=True)
+
     private_key: str = Field(..., description="Clé privée DEX à tester")
-    dex_type: Literal["hyperliquid"] = Field(default="hyperliquid", description="Type de DEX")
+    dex_type: DexType = Field(default=DexType.HYPERLIQUID, description="Type de DEX")
     use_testnet: bool = Field(default=False, description="Utiliser le testnet")
 
 
 class HyperliquidUserInfo(BaseModel):
     """Schéma spécialisé pour les informations utilisateur Hyperliquid"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     wallet_address: str
-    network: Literal["mainnet", "testnet"]
+    network: Network
     user_state_available: bool
     account_value: Optional[float] = None
     open_positions: Optional[int] = None
@@ -379,6 +450,8 @@ class HyperliquidUserInfo(BaseModel):
 
 class AnthropicApiInfo(BaseModel):
     """Schéma spécialisé pour les informations API Anthropic"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     api_version: str
     model_used: str
     available_models: Optional[list] = None
@@ -386,6 +459,8 @@ class AnthropicApiInfo(BaseModel):
 
 class CoinGeckoApiInfo(BaseModel):
     """Schéma spécialisé pour les informations API CoinGecko"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     plan_type: str  # demo, startup, pro, etc.
     rate_limit: Optional[int] = None
     monthly_calls_used: Optional[int] = None
@@ -401,22 +476,26 @@ class ApiValidationInfo(BaseModel):
 
 class DexValidationInfo(BaseModel):
     """Informations de validation pour les DEX"""
-    network: Literal["mainnet", "testnet"]
+    network: Network
     connector_type: Literal["hyperliquid"]
     sdk_used: bool
 
 
 class ConnectorTestResponse(BaseModel):
     """Schéma de réponse pour les tests de connexion"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
     status: Literal["success", "error"]
     message: str
     data: Optional[Union[HyperliquidUserInfo, AnthropicApiInfo, CoinGeckoApiInfo]] = None
     validation: Optional[Union[ApiValidationInfo, DexValidationInfo]] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_now)
 
 
 class KeyFormatValidation(BaseModel):
     """Schéma pour la validation de format de clé"""
+    model_config = ConfigDict(frozen=True)
+
     key: str = Field(..., description="Clé à valider")
     key_type: Literal["api_key", "private_key"] = Field(..., description="Type de clé")
     service_type: str = Field(..., description="Type de service (anthropic, hyperliquid, coingecko, etc.)")
@@ -424,5 +503,7 @@ class KeyFormatValidation(BaseModel):
 
 class UserInfoRequest(BaseModel):
     """Schéma pour récupérer les informations utilisateur"""
-    service_type: Literal["hyperliquid", "anthropic", "coingecko"]
+    model_config = ConfigDict(frozen=True)
+
+    service_type: ServiceType
     use_testnet: bool = Field(default=False, description="Pour Hyperliquid uniquement")
@@ -3,25 +3,50 @@ Service pour le domaine users - Logique métier des profils et préférences
 """
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
-import json
+from sqlalchemy import delete, exists, insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Dict, Any, List
 import logging
+import re
 
 from .models import UserProfile, UserTradingPreferences
 from .schemas import (
     UserProfileUpdate, ApiKeyUpdate, UserProfileResponse,
     UserTradingPreferencesCreate, UserTradingPreferencesUpdate,
-    UserTradingPreferencesResponse, UserTradingPreferencesDefault
+    UserTradingPreferencesResponse, UserTradingPreferencesDefault,
+    ENCRYPTED_KEY_FIELDS
 )
+from .api_key_testing import invalidate_validation_cache
 from ..auth.models import User
-from ...core import encrypt_api_key
+from ...core import encrypt_api_key, TTLCache
 
 logger = logging.getLogger(__name__)
 
 
+# ========== Cache des lectures profil / préférences ==========
+
+# Durée de vie courte : l'invalidation n'est faite que dans le worker qui écrit
+_USER_CACHE_TTL = 60.0
+_USER_CACHE_MAX_SIZE = 10_000
+
+# user_id -> UserProfileResponse / UserTradingPreferencesResponse (schémas immuables)
+_profile_cache = TTLCache(ttl=_USER_CACHE_TTL, max_size=_USER_CACHE_MAX_SIZE)
+_preferences_cache = TTLCache(ttl=_USER_CACHE_TTL, max_size=_USER_CACHE_MAX_SIZE)
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """Purge le profil et les préférences en cache d'un utilisateur"""
+    _profile_cache.delete(user_id)
+    _preferences_cache.delete(user_id)
+
+
 # ========== Helpers ==========
 
+# Adresse publique Hyperliquid : 0x + 40 caractères hexadécimaux
+_HYPERLIQUID_ADDRESS_RE = re.compile(r'0x[0-9a-fA-F]{40}\Z')
+
 def _normalize_hyperliquid_address(address: Optional[str]) -> Optional[str]:
     """
     Normalise et valide une adresse publique Hyperliquid
@@ -42,45 +67,20 @@ def _normalize_hyperliquid_address(address: Optional[str]) -> Optional[str]:
     if not normalized:
         return None
 
+    # Chemin rapide : préfixe, longueur et hex vérifiés en une passe
+    if _HYPERLIQUID_ADDRESS_RE.match(normalized):
+        return normalized.lower()
+
     if not normalized.startswith("0x") or len(normalized) != 42:
         raise HTTPException(
             status_code=400,
             detail="Adresse publique Hyperliquid invalide. Elle doit commencer par 0x et contenir 42 caractères."
         )
 
-    try:
-        int(normalized[2:], 16)
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail="Adresse publique Hyperliquid invalide. Elle doit contenir uniquement des caractères hexadécimaux."
-        )
-
-    return normalized.lower()
-
-
-def _serialize_preferences_for_db(preferences_data: dict) -> dict:
-    """
-    Sérialise les données de préférences pour le stockage en base
-
-    Convertit les listes Python en JSON strings pour SQLAlchemy
-
-    Args:
-        preferences_data: Dictionnaire des préférences
-
-    Returns:
-        Dictionnaire sérialisé pour la base de données
-    """
-    serialized = preferences_data.copy()
-
-    # Convertir les listes en JSON strings pour le stockage
-    if 'preferred_assets' in serialized and isinstance(serialized['preferred_assets'], list):
-        serialized['preferred_assets'] = json.dumps(serialized['preferred_assets'])
-
-    if 'technical_indicators' in serialized and isinstance(serialized['technical_indicators'], list):
-        serialized['technical_indicators'] = json.dumps(serialized['technical_indicators'])
-
-    return serialized
+    raise HTTPException(
+        status_code=400,
+        detail="Adresse publique Hyperliquid invalide. Elle doit contenir uniquement des caractères hexadécimaux."
+    )
 
 
 # ========== Service UserProfile ==========
@@ -89,57 +89,85 @@ class UserService:
     """Service de gestion des profils utilisateurs"""
 
     @staticmethod
-    def get_or_create_profile(db: Session, user: User) -> UserProfile:
+    async def get_or_create_profile(db: AsyncSession, user: User) -> UserProfile:
         """
         Récupère ou crée le profil utilisateur
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
 
         Returns:
             UserProfile: Profil de l'utilisateur
         """
-        profile = db.query(UserProfile).filter(UserProfile.user_id == user.id).first()
+        profile = await db.scalar(select(UserProfile).where(UserProfile.user_id == user.id))
 
         if not profile:
-            # Créer un profil vide
-            profile = UserProfile(user_id=user.id)
-            db.add(profile)
-            db.commit()
-            db.refresh(profile)
-            logger.info(f"Profil créé pour l'utilisateur {user.id}")
+            # Créer un profil vide en une requête (INSERT ... ON CONFLICT DO NOTHING RETURNING) :
+            # deux premières requêtes concurrentes ne peuvent plus créer de doublon
+            stmt = (
+                pg_insert(UserProfile)
+                .values(user_id=user.id)
+                .on_conflict_do_nothing(index_elements=[UserProfile.user_id])
+                .returning(UserProfile)
+            )
+            profile = (await db.scalars(stmt)).first()
+            await db.commit()
+
+            if profile is None:
+                # Une requête concurrente a créé le profil entre-temps
+                profile = (await db.scalars(
+                    select(UserProfile).where(UserProfile.user_id == user.id)
+                )).one()
+            else:
+                logger.info(f"Profil créé pour l'utilisateur {user.id}")
 
         return profile
 
     @staticmethod
-    def get_profile_response(db: Session, user: User) -> UserProfileResponse:
+    async def get_profile_response(
+        db: AsyncSession,
+        user: User,
+        profile: Optional[UserProfile] = None
+    ) -> UserProfileResponse:
         """
         Récupère le profil complet avec clés masquées
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
+            profile: Profil déjà chargé pour la requête (évite un nouveau SELECT)
 
         Returns:
             UserProfileResponse: Profil avec clés masquées
+
+        Sans profil fourni, la réponse est servie depuis le cache si possible.
         """
-        profile = UserService.get_or_create_profile(db, user)
-        return UserProfileResponse.from_user_and_profile(user, profile)
+        if profile is None:
+            cached = _profile_cache.get(user.id)
+            if cached is not None:
+                return cached
+            profile = await UserService.get_or_create_profile(db, user)
+
+        response = UserProfileResponse.from_user_and_profile(user, profile)
+        _profile_cache.set(user.id, response)
+        return response
 
     @staticmethod
-    def update_profile(
-        db: Session,
+    async def update_profile(
+        db: AsyncSession,
         user: User,
-        profile_update: UserProfileUpdate
+        profile_update: UserProfileUpdate,
+        profile: Optional[UserProfile] = None
     ) -> UserProfileResponse:
         """
         Met à jour le profil utilisateur (email, username)
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
             profile_update: Données de mise à jour
+            profile: Profil déjà chargé pour la requête
 
         Returns:
             UserProfileResponse: Profil mis à jour avec clés masquées
@@ -149,40 +177,56 @@ class UserService:
         """
         update_data = profile_update.model_dump(exclude_unset=True)
 
-        # Vérifier les doublons email/username
-        if "email" in update_data or "username" in update_data:
-            query = db.query(User).filter(User.id != user.id)
-
-            if "email" in update_data:
-                existing_email = query.filter(User.email == update_data["email"]).first()
-                if existing_email:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Email already in use"
-                    )
-
-            if "username" in update_data:
-                existing_username = query.filter(User.username == update_data["username"]).first()
-                if existing_username:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Username already taken"
-                    )
-
-        # Mettre à jour les champs du User
-        for field, value in update_data.items():
-            setattr(user, field, value)
+        # Vérifier les doublons email/username en une seule requête
+        conditions = []
+        if "email" in update_data:
+            conditions.append(User.email == update_data["email"])
+        if "username" in update_data:
+            conditions.append(User.username == update_data["username"])
+
+        if conditions:
+            conflicts = (await db.execute(
+                select(User.email, User.username).where(
+                    User.id != user.id,
+                    or_(*conditions)
+                )
+            )).all()
 
-        db.commit()
-        db.refresh(user)
+            # L'email est prioritaire, comme avant le regroupement des requêtes
+            if "email" in update_data and any(c.email == update_data["email"] for c in conflicts):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Email already in use"
+                )
 
-        return UserService.get_profile_response(db, user)
+            if "username" in update_data and any(c.username == update_data["username"] for c in conflicts):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Username already taken"
+                )
+
+        # Mettre à jour les champs du User : UPDATE ... RETURNING rafraîchit l'instance
+        # de la session (updated_at calculé par la base) en un seul aller-retour
+        if update_data:
+            user = (await db.scalars(
+                update(User)
+                .where(User.id == user.id)
+                .values(**update_data)
+                .returning(User)
+            )).one()
+
+            await db.commit()
+
+        invalidate_user_cache(user.id)
+
+        return await UserService.get_profile_response(db, user, profile)
 
     @staticmethod
-    def update_api_keys(
-        db: Session,
+    async def update_api_keys(
+        db: AsyncSession,
         user: User,
-        api_keys: ApiKeyUpdate
+        api_keys: ApiKeyUpdate,
+        profile: Optional[UserProfile] = None
     ) -> UserProfileResponse:
         """
         Met à jour les clés API de l'utilisateur
@@ -190,15 +234,17 @@ class UserService:
         ✅ OPTIMISATION : Méthode unifiée qui élimine la duplication (2× dans routes/users.py)
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
             api_keys: Clés API à mettre à jour
+            profile: Profil déjà chargé pour la requête
 
         Returns:
             UserProfileResponse: Profil mis à jour avec clés masquées
         """
         # Récupérer ou créer le profil
-        profile = UserService.get_or_create_profile(db, user)
+        if profile is None:
+            profile = await UserService.get_or_create_profile(db, user)
 
         # Extraire les données à mettre à jour
         update_data = api_keys.model_dump(exclude_unset=True)
@@ -209,7 +255,7 @@ class UserService:
                 # Normaliser et valider l'adresse
                 profile.hyperliquid_public_address = _normalize_hyperliquid_address(value)
 
-            elif field in ["hyperliquid_api_key", "anthropic_api_key", "coingecko_api_key"]:
+            elif field in ENCRYPTED_KEY_FIELDS:
                 if value:
                     # Chiffrer la clé avant stockage
                     encrypted_value = encrypt_api_key(value)
@@ -218,26 +264,71 @@ class UserService:
                     # Supprimer la clé
                     setattr(profile, field, None)
 
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+
+        # Les résultats de tests des anciennes clés ne sont plus valables
+        invalidate_validation_cache(user.id)
+        invalidate_user_cache(user.id)
 
-        return UserService.get_profile_response(db, user)
+        return await UserService.get_profile_response(db, user, profile)
 
 
 # ========== Service UserTradingPreferences ==========
 
+# Préférences par défaut (schéma immuable) et colonnes correspondantes, calculées une seule fois
+_DEFAULTS = UserTradingPreferencesDefault()
+_DEFAULT_PREFERENCES_ROW: Dict[str, Any] = _DEFAULTS.model_dump()
+
+
 class PreferencesService:
     """Service de gestion des préférences de trading"""
 
     @staticmethod
-    def create_default_preferences(db: Session, user: User) -> UserTradingPreferences:
+    async def bulk_create_defaults(db: AsyncSession, user_ids: List[int]) -> List[UserTradingPreferences]:
+        """
+        Crée des préférences par défaut pour plusieurs utilisateurs
+
+        Un seul INSERT multi-lignes (RETURNING) et un seul commit, quel que soit
+        le nombre d'utilisateurs (seed, imports, migrations).
+
+        Args:
+            db: Session de base de données asynchrone
+            user_ids: IDs des utilisateurs à initialiser
+
+        Returns:
+            List[UserTradingPreferences]: Préférences créées
+        """
+        if not user_ids:
+            return []
+
+        rows = [
+            {
+                "user_id": user_id,
+                **_DEFAULT_PREFERENCES_ROW,
+                # Listes JSONB copiées par ligne (valeurs par défaut partagées)
+                "preferred_assets": list(_DEFAULT_PREFERENCES_ROW["preferred_assets"]),
+                "technical_indicators": list(_DEFAULT_PREFERENCES_ROW["technical_indicators"]),
+            }
+            for user_id in user_ids
+        ]
+
+        created = list(await db.scalars(
+            insert(UserTradingPreferences).returning(UserTradingPreferences),
+            rows
+        ))
+        await db.commit()
+
+        return created
+
+    @staticmethod
+    async def create_default_preferences(db: AsyncSession, user: User) -> UserTradingPreferences:
         """
         Crée des préférences par défaut pour un utilisateur
 
         ✅ OPTIMISATION : Logique métier déplacée du router vers le service
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
 
         Returns:
@@ -247,66 +338,54 @@ class PreferencesService:
             HTTPException: Si erreur de création
         """
         try:
-            default_data = UserTradingPreferencesDefault()
-
-            db_preferences = UserTradingPreferences(
-                user_id=user.id,
-                risk_tolerance=default_data.risk_tolerance,
-                investment_horizon=default_data.investment_horizon,
-                trading_style=default_data.trading_style,
-                max_position_size=default_data.max_position_size,
-                stop_loss_percentage=default_data.stop_loss_percentage,
-                take_profit_ratio=default_data.take_profit_ratio,
-                preferred_assets=json.dumps(default_data.preferred_assets),
-                technical_indicators=json.dumps(default_data.technical_indicators)
-            )
-
-            db.add(db_preferences)
-            db.commit()
-            db.refresh(db_preferences)
-
-            logger.info(f"Préférences par défaut créées pour l'utilisateur {user.id}")
-            return db_preferences
-
-        except Exception as e:
+            db_preferences = (await PreferencesService.bulk_create_defaults(db, [user.id]))[0]
+        except SQLAlchemyError as e:
             logger.error(f"Erreur création préférences par défaut pour utilisateur {user.id}: {e}")
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Erreur lors de la création des préférences par défaut"
             )
 
+        logger.info(f"Préférences par défaut créées pour l'utilisateur {user.id}")
+        return db_preferences
+
     @staticmethod
-    def get_preferences(db: Session, user: User) -> UserTradingPreferencesResponse:
+    async def get_preferences(db: AsyncSession, user: User) -> UserTradingPreferencesResponse:
         """
         Récupère les préférences de l'utilisateur
 
         Si l'utilisateur n'a pas de préférences, retourne les valeurs par défaut
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
 
         Returns:
             UserTradingPreferencesResponse: Préférences de l'utilisateur
         """
-        try:
-            db_preferences = db.query(UserTradingPreferences).filter(
-                UserTradingPreferences.user_id == user.id
-            ).first()
+        cached = _preferences_cache.get(user.id)
+        if cached is not None:
+            return cached
 
-            return UserTradingPreferencesResponse.from_db_model(db_preferences)
-
-        except Exception as e:
+        try:
+            db_preferences = await db.scalar(
+                select(UserTradingPreferences).where(UserTradingPreferences.user_id == user.id)
+            )
+        except SQLAlchemyError as e:
             logger.error(f"Erreur récupération préférences pour utilisateur {user.id}: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Erreur lors de la récupération des préférences"
             )
 
+        response = UserTradingPreferencesResponse.from_db_model(db_preferences)
+        _preferences_cache.set(user.id, response)
+        return response
+
     @staticmethod
-    def create_preferences(
-        db: Session,
+    async def create_preferences(
+        db: AsyncSession,
         user: User,
         preferences_data: UserTradingPreferencesCreate
     ) -> UserTradingPreferencesResponse:
@@ -314,7 +393,7 @@ class PreferencesService:
         Crée ou met à jour les préférences de trading
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
             preferences_data: Données des préférences
 
@@ -326,46 +405,41 @@ class PreferencesService:
         """
         try:
             # Vérifier si des préférences existent déjà
-            existing = db.query(UserTradingPreferences).filter(
-                UserTradingPreferences.user_id == user.id
-            ).first()
-
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Preferences already exist. Use PUT to update."
-                )
-
-            # Préparer les données pour la base de données
-            pref_dict = preferences_data.model_dump()
-            serialized_data = _serialize_preferences_for_db(pref_dict)
-
-            # Créer les préférences
-            db_preferences = UserTradingPreferences(
-                user_id=user.id,
-                **serialized_data
+            existing = await db.scalar(
+                select(exists().where(UserTradingPreferences.user_id == user.id))
             )
 
-            db.add(db_preferences)
-            db.commit()
-            db.refresh(db_preferences)
-
-            logger.info(f"Préférences créées pour l'utilisateur {user.id}")
-            return UserTradingPreferencesResponse.from_db_model(db_preferences)
+            if not existing:
+                # Créer les préférences (listes stockées telles quelles en JSONB)
+                db_preferences = UserTradingPreferences(
+                    user_id=user.id,
+                    **preferences_data.model_dump()
+                )
 
-        except HTTPException:
-            raise
-        except Exception as e:
+                db.add(db_preferences)
+                await db.commit()
+        except SQLAlchemyError as e:
             logger.error(f"Erreur création préférences pour utilisateur {user.id}: {e}")
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erreur lors de la création des préférences: {str(e)}"
             )
 
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Preferences already exist. Use PUT to update."
+            )
+
+        invalidate_user_cache(user.id)
+
+        logger.info(f"Préférences créées pour l'utilisateur {user.id}")
+        return UserTradingPreferencesResponse.from_db_model(db_preferences)
+
     @staticmethod
-    def update_preferences(
-        db: Session,
+    async def update_preferences(
+        db: AsyncSession,
         user: User,
         preferences_update: UserTradingPreferencesUpdate
     ) -> UserTradingPreferencesResponse:
@@ -373,89 +447,95 @@ class PreferencesService:
         Met à jour les préférences de trading
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
             preferences_update: Données de mise à jour
 
         Returns:
             UserTradingPreferencesResponse: Préférences mises à jour
         """
+        # Récupérer les préférences existantes
         try:
-            # Récupérer les préférences existantes
-            db_preferences = db.query(UserTradingPreferences).filter(
-                UserTradingPreferences.user_id == user.id
-            ).first()
-
-            # Créer les préférences si elles n'existent pas
-            if not db_preferences:
-                db_preferences = PreferencesService.create_default_preferences(db, user)
-
-            # Mettre à jour les champs fournis
-            update_data = preferences_update.model_dump(exclude_unset=True)
-            serialized_data = _serialize_preferences_for_db(update_data)
+            db_preferences = await db.scalar(
+                select(UserTradingPreferences).where(UserTradingPreferences.user_id == user.id)
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Erreur récupération préférences pour utilisateur {user.id}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erreur lors de la récupération des préférences"
+            )
 
-            for field, value in serialized_data.items():
-                setattr(db_preferences, field, value)
+        # Créer les préférences si elles n'existent pas
+        if not db_preferences:
+            db_preferences = await PreferencesService.create_default_preferences(db, user)
 
-            db.commit()
-            db.refresh(db_preferences)
+        # Mettre à jour les champs fournis
+        update_data = preferences_update.model_dump(exclude_unset=True)
 
-            logger.info(f"Préférences mises à jour pour l'utilisateur {user.id}")
-            return UserTradingPreferencesResponse.from_db_model(db_preferences)
+        for field, value in update_data.items():
+            setattr(db_preferences, field, value)
 
-        except Exception as e:
+        try:
+            await db.commit()
+        except SQLAlchemyError as e:
             logger.error(f"Erreur mise à jour préférences pour utilisateur {user.id}: {e}")
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Erreur lors de la mise à jour des préférences: {str(e)}"
             )
 
+        invalidate_user_cache(user.id)
+
+        logger.info(f"Préférences mises à jour pour l'utilisateur {user.id}")
+        return UserTradingPreferencesResponse.from_db_model(db_preferences)
+
     @staticmethod
-    def delete_preferences(db: Session, user: User) -> Dict[str, str]:
+    async def delete_preferences(db: AsyncSession, user: User) -> Dict[str, str]:
         """
         Supprime les préférences de l'utilisateur
 
         Args:
-            db: Session de base de données
+            db: Session de base de données asynchrone
             user: Instance du modèle User
 
         Returns:
             dict: Message de confirmation
         """
         try:
-            db_preferences = db.query(UserTradingPreferences).filter(
-                UserTradingPreferences.user_id == user.id
-            ).first()
-
-            if not db_preferences:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Preferences not found"
-                )
-
-            db.delete(db_preferences)
-            db.commit()
-
-            logger.info(f"Préférences supprimées pour l'utilisateur {user.id}")
-            return {"message": "Preferences deleted successfully"}
-
-        except HTTPException:
-            raise
-        except Exception as e:
+            # DELETE direct : pas de SELECT préalable, le nombre de lignes suffit
+            deleted = (await db.execute(
+                delete(UserTradingPreferences).where(UserTradingPreferences.user_id == user.id)
+            )).rowcount
+
+            if deleted:
+                await db.commit()
+        except SQLAlchemyError as e:
             logger.error(f"Erreur suppression préférences pour utilisateur {user.id}: {e}")
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Erreur lors de la suppression des préférences"
             )
 
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Preferences not found"
+            )
+
+        invalidate_user_cache(user.id)
+
+        logger.info(f"Préférences supprimées pour l'utilisateur {user.id}")
+        return {"message": "Preferences deleted successfully"}
+
     @staticmethod
     def get_default_preferences() -> UserTradingPreferencesDefault:
         """
         Retourne les valeurs par défaut des préférences
 
         Returns:
-            UserTradingPreferencesDefault: Valeurs par défaut
+            UserTradingPreferencesDefault: Valeurs par défaut (instance partagée, immuable)
         """
-        return UserTradingPreferencesDefault()
+        return _DEFAULTS
@@ -1,11 +1,13 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import text
 import logging
 import sys
 import time
-from .core import engine, get_db, Base
-from .domains import auth_router, users_router
+from .core import engine, async_engine, get_db, Base, get_http_client, close_http_client
+from .domains import auth_router, users_router, users_stateless_router
 from .domains.market import router as market_router
 from .domains.trading import router as trading_router
 from .domains import ai, ai_profile
@@ -27,7 +29,21 @@ logger = logging.getLogger(__name__)
 # Créer les tables
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Trading Tool API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cycle de vie : client HTTP partagé ouvert au démarrage, ressources fermées à l'arrêt"""
+    get_http_client()
+    yield
+    await close_http_client()
+    await async_engine.dispose()
+
+
+app = FastAPI(
+    title="Trading Tool API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Configuration CORS
 app.add_middleware(
@@ -45,6 +61,7 @@ app.add_middleware(
 # Nouveaux routers depuis domains/ (architecture DDD)
 app.include_router(auth_router)
 app.include_router(users_router)
+app.include_router(users_stateless_router)  # Endpoints users sans DB
 app.include_router(market_router)
 app.include_router(trading_router)
 app.include_router(ai.router)  # Nouveau : Infrastructure IA multi-providers
@@ -1,18 +1,43 @@
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple, Optional
 from ...domains.ai.providers.anthropic import AnthropicProvider
 from ...domains.market.adapters.coingecko import CoinGeckoAdapter
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class ValidationResult(NamedTuple):
+    """Résultat d'une validation de connexion à une API standard"""
+    status: str
+    message: str
+    data: Optional[Dict[str, Any]] = None
+    validation: Optional[Dict[str, Any]] = None
+    # Le fournisseur n'a pas répondu à temps (alimente le disjoncteur)
+    timeout: bool = False
+
+
+# Informations de validation ajoutées aux tests réussis (constantes, ne pas muter)
+_ANTHROPIC_VALIDATION_INFO = {
+    "api_type": "anthropic",
+    "connector_type": "standard_api",
+    "authentication_method": "api_key"
+}
+
+_COINGECKO_VALIDATION_INFO = {
+    "api_type": "coingecko",
+    "connector_type": "standard_api",
+    "authentication_method": "api_key"
+}
+
+
 class ApiValidator:
     """Service de validation pour les APIs standard (clé API simple)"""
 
-    def __init__(self):
-        self.anthropic_provider = AnthropicProvider()
+    def __init__(self, use_shared_client: bool = False):
+        self.anthropic_provider = AnthropicProvider(use_shared_client=use_shared_client)
         self.coingecko_connector = CoinGeckoAdapter()
 
-    async def validate_anthropic(self, api_key: str) -> Dict[str, Any]:
+    async def validate_anthropic(self, api_key: str) -> ValidationResult:
         """
         Valide la connexion à l'API Anthropic
 
@@ -20,29 +45,27 @@ class ApiValidator:
             api_key: Clé API Anthropic
 
         Returns:
-            Dict avec le résultat de la validation
+            ValidationResult (status, message, data, validation)
         """
         try:
             result = await self.anthropic_provider.test_connection(api_key)
 
             # Enrichir le résultat avec des informations de validation
-            if result["status"] == "success":
-                result["validation"] = {
-                    "api_type": "anthropic",
-                    "connector_type": "standard_api",
-                    "authentication_method": "api_key"
-                }
+            validation = _ANTHROPIC_VALIDATION_INFO if result["status"] == "success" else None
 
-            return result
+            return ValidationResult(
+                result["status"],
+                result["message"],
+                result.get("data"),
+                validation,
+                result.get("timeout", False)
+            )
 
         except Exception as e:
-            logger.error(f"Erreur validation Anthropic: {e}")
-            return {
-                "status": "error",
-                "message": f"Erreur de validation: {str(e)}"
-            }
+            logger.error("Erreur validation Anthropic: %s", e)
+            return ValidationResult("error", f"Erreur de validation: {str(e)}")
 
-    async def validate_coingecko(self, api_key: str) -> Dict[str, Any]:
+    async def validate_coingecko(self, api_key: str) -> ValidationResult:
         """
         Valide la connexion à l'API CoinGecko
 
@@ -50,27 +73,25 @@ class ApiValidator:
             api_key: Clé API CoinGecko
 
         Returns:
-            Dict avec le résultat de la validation
+            ValidationResult (status, message, data, validation)
         """
         try:
             result = await self.coingecko_connector.test_connection(api_key)
 
             # Enrichir le résultat avec des informations de validation
-            if result["status"] == "success":
-                result["validation"] = {
-                    "api_type": "coingecko",
-                    "connector_type": "standard_api",
-                    "authentication_method": "api_key"
-                }
+            validation = _COINGECKO_VALIDATION_INFO if result["status"] == "success" else None
 
-            return result
+            return ValidationResult(
+                result["status"],
+                result["message"],
+                result.get("data"),
+                validation,
+                result.get("timeout", False)
+            )
 
         except Exception as e:
-            logger.error(f"Erreur validation CoinGecko: {e}")
-            return {
-                "status": "error",
-                "message": f"Erreur de validation: {str(e)}"
-            }
+            logger.error("Erreur validation CoinGecko: %s", e)
+            return ValidationResult("error", f"Erreur de validation: {str(e)}")
 
     async def get_anthropic_models(self, api_key: str) -> Dict[str, Any]:
         """
@@ -91,7 +112,7 @@ class ApiValidator:
             }
 
         except Exception as e:
-            logger.error(f"Erreur récupération modèles: {e}")
+            logger.error("Erreur récupération modèles: %s", e)
             return {
                 "status": "error",
                 "message": f"Erreur: {str(e)}"
@@ -111,7 +132,7 @@ class ApiValidator:
             return await self.coingecko_connector.get_api_info(api_key)
 
         except Exception as e:
-            logger.error(f"Erreur récupération info CoinGecko: {e}")
+            logger.error("Erreur récupération info CoinGecko: %s", e)
             return {
                 "status": "error",
                 "message": f"Erreur: {str(e)}"
@@ -190,7 +211,7 @@ class ApiValidator:
                 }
 
         except Exception as e:
-            logger.error(f"Erreur validation format clé API: {e}")
+            logger.error("Erreur validation format clé API: %s", e)
             return {
                 "status": "error",
                 "message": f"Erreur de validation: {str(e)}"
@@ -2,6 +2,9 @@ import { toHttpError } from './errors';
 
 const REFRESH_ENDPOINT = '/api/auth/refresh';
 
+// Rafraîchissement en cours, partagé par tous les appelants
+let refreshInFlight: Promise<boolean> | null = null;
+
 /**
  * Rafraîchissement des tokens avec système hybride
  *
@@ -9,8 +12,21 @@ const REFRESH_ENDPOINT = '/api/auth/refresh';
  * (credentials: 'include'), donc pas besoin de l'inclure dans le body.
  *
  * Le backend retourne un nouveau access_token + met à jour le cookie.
+ *
+ * Single-flight : les refresh tokens sont à usage unique (rotation), donc
+ * les requêtes qui reçoivent un 401 simultanément attendent toutes le même
+ * appel au lieu d'envoyer chacune le même cookie.
  */
-export async function tryRefresh(): Promise<boolean> {
+export function tryRefresh(): Promise<boolean> {
+  if (!refreshInFlight) {
+    refreshInFlight = doRefresh().finally(() => {
+      refreshInFlight = null;
+    });
+  }
+  return refreshInFlight;
+}
+
+async function doRefresh(): Promise<boolean> {
   try {
     const res = await fetch(REFRESH_ENDPOINT, {
       method: 'POST',